@@ -4,11 +4,31 @@ Manages SQLite database for storing inspection history
 """
 import sqlite3
 import json
+import logging
 import os
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime
 from pathlib import Path
 import shutil
 
+# Use orjson for faster JSON serialization when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+log = logging.getLogger(__name__)
+
+
+def json_dumps_text(obj):
+    """Serialize to a compact JSON string for a TEXT column (orjson if installed)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj).decode('utf-8')
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits; stdlib json handles them
+    return json.dumps(obj)
+
 
 class HistoryManager:
     """Manage inspection history with SQLite database"""
@@ -17,46 +37,80 @@ class HistoryManager:
         self.db_path = db_path
         self.image_dir = Path(image_dir)
         self.image_dir.mkdir(exist_ok=True)
+
+        # One connection per manager, kept open so SQLite's statement cache
+        # reuses prepared queries; the lock serializes use across threads
+        # (GUI reads, background saves)
+        self._conn = None
+        self._lock = threading.RLock()
+        self._stats_cache = None  # ((data_version, date), stats) from get_statistics
+
         self.init_database()
 
+    def _get_connection(self):
+        """Get the shared database connection (opened on first use, call with _lock held)"""
+        if self._conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=128)
+            conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+            # WAL with synchronous=NORMAL: a commit appends to the log without
+            # an fsync per transaction and stays durable across app crashes.
+            # (Reads and writes still take turns on this one connection.)
+            conn.executescript("""
+                PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA cache_size=-20000;
+                PRAGMA busy_timeout=5000;
+            """)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._stats_cache = None
+
     def init_database(self):
         """Initialize database and create tables if not exist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Create inspections table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS inspections (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                device_id TEXT,
-                image_id TEXT,
-                result TEXT,
-                station TEXT,
-                inspection_name TEXT,
-                image_path TEXT,
-                json_data TEXT,
-                rule_results TEXT
-            )
-        """)
-
-        # Create indexes for faster queries
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_timestamp
-            ON inspections(timestamp DESC)
-        """)
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_device_id
-            ON inspections(device_id)
-        """)
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_result
-            ON inspections(result)
-        """)
-
-        conn.commit()
-        conn.close()
-        print("✓ History database initialized")
+        with self._lock:
+            conn = self._get_connection()
+
+            # Gather stats once when the date(timestamp) index is first built
+            has_day_index = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_day'"
+            ).fetchone() is not None
+
+            # Create the table and indexes in one script / transaction. idx_day
+            # is an expression index for today's count and cleanup; the
+            # date-range filters use idx_timestamp
+            conn.executescript("""
+                BEGIN;
+                CREATE TABLE IF NOT EXISTS inspections (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    device_id TEXT,
+                    image_id TEXT,
+                    result TEXT,
+                    station TEXT,
+                    inspection_name TEXT,
+                    image_path TEXT,
+                    json_data TEXT,
+                    rule_results TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_timestamp ON inspections(timestamp DESC);
+                CREATE INDEX IF NOT EXISTS idx_device_id ON inspections(device_id);
+                CREATE INDEX IF NOT EXISTS idx_result ON inspections(result);
+                CREATE INDEX IF NOT EXISTS idx_day ON inspections(date(timestamp), result);
+                COMMIT;
+            """)
+            if not has_day_index:
+                conn.execute("ANALYZE inspections")
+
+            conn.commit()
+        log.info("✓ History database initialized")
 
     def save_inspection(self, data, image_pixmap=None):
         """
@@ -69,6 +123,47 @@ class HistoryManager:
         Returns:
             int: ID of saved record
         """
+        return self.save_inspections([(data, image_pixmap)])[0]
+
+    def save_inspections(self, items):
+        """
+        Save several inspection results in one transaction
+
+        Args:
+            items: list of (data, image_pixmap) tuples, as for save_inspection
+
+        Returns:
+            list: IDs of saved records, in input order
+        """
+        rows = [self._inspection_row(data, image_pixmap) for data, image_pixmap in items]
+
+        # Save to database (one commit for the whole batch)
+        with self._lock:
+            conn = self._get_connection()
+            cursor = conn.cursor()
+
+            record_ids = []
+            try:
+                for row in rows:
+                    cursor.execute("""
+                        INSERT INTO inspections
+                        (timestamp, device_id, image_id, result, station, inspection_name,
+                         image_path, json_data, rule_results)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """, row)
+                    record_ids.append(cursor.lastrowid)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            self._stats_cache = None
+
+        for record_id, row in zip(record_ids, rows):
+            log.debug("✓ Saved inspection #%s: %s - %s", record_id, row[1], row[3])
+        return record_ids
+
+    def _inspection_row(self, data, image_pixmap=None):
+        """Save the image (if any) and build the inspections row for one result"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         device_id = data.get("Device ID", "")
         image_id = data.get("Image ID", "")
@@ -82,22 +177,13 @@ class HistoryManager:
             filename = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{device_id}.jpg"
             image_path = str(self.image_dir / filename)
             image_pixmap.save(image_path, "JPG", quality=95)
-            print(f"✓ Saved image: {image_path}")
+            log.debug("✓ Saved image: %s", image_path)
 
         # Extract rule results
         rule_results = data.get("Rule Results", [])
-        rule_results_json = json.dumps(rule_results) if rule_results else None
-
-        # Save to database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO inspections
-            (timestamp, device_id, image_id, result, station, inspection_name,
-             image_path, json_data, rule_results)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        rule_results_json = json_dumps_text(rule_results) if rule_results else None
+
+        return (
             timestamp,
             device_id,
             image_id,
@@ -105,16 +191,35 @@ class HistoryManager:
             station,
             inspection_name,
             image_path,
-            json.dumps(data),
+            json_dumps_text(data),
             rule_results_json
-        ))
+        )
 
-        record_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+    @staticmethod
+    def _filter_clause(device_id=None, result=None, date_from=None, date_to=None):
+        """Build the WHERE clause and parameters shared by the filtered queries"""
+        query = " WHERE 1=1"
+        params = []
 
-        print(f"✓ Saved inspection #{record_id}: {device_id} - {result}")
-        return record_id
+        if device_id:
+            query += " AND device_id = ?"
+            params.append(device_id)
+
+        if result:
+            query += " AND result = ?"
+            params.append(result)
+
+        # Compare the raw column ('YYYY-MM-DD HH:MM:SS' sorts as text) so
+        # idx_timestamp serves both the range and ORDER BY timestamp ... LIMIT
+        if date_from:
+            query += " AND timestamp >= date(?)"
+            params.append(date_from)
+
+        if date_to:
+            query += " AND timestamp < date(?, '+1 day')"
+            params.append(date_to)
+
+        return query, params
 
     def get_inspections(self, limit=100, offset=0, device_id=None,
                        result=None, date_from=None, date_to=None):
@@ -132,79 +237,35 @@ class HistoryManager:
         Returns:
             list: List of inspection records
         """
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Return rows as dictionaries
-        cursor = conn.cursor()
-
-        query = "SELECT * FROM inspections WHERE 1=1"
-        params = []
-
-        if device_id:
-            query += " AND device_id = ?"
-            params.append(device_id)
-
-        if result:
-            query += " AND result = ?"
-            params.append(result)
-
-        if date_from:
-            query += " AND date(timestamp) >= date(?)"
-            params.append(date_from)
-
-        if date_to:
-            query += " AND date(timestamp) <= date(?)"
-            params.append(date_to)
+        where, params = self._filter_clause(device_id, result, date_from, date_to)
+        query = "SELECT * FROM inspections" + where
 
         query += " ORDER BY timestamp DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
 
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+        with self._lock:
+            rows = self._get_connection().execute(query, params).fetchall()
 
         # Convert to list of dicts
         return [dict(row) for row in rows]
 
     def get_inspection_by_id(self, record_id):
         """Get single inspection by ID"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM inspections WHERE id = ?", (record_id,))
-        row = cursor.fetchone()
-        conn.close()
+        with self._lock:
+            row = self._get_connection().execute(
+                "SELECT * FROM inspections WHERE id = ?", (record_id,)
+            ).fetchone()
 
         return dict(row) if row else None
 
     def get_total_count(self, device_id=None, result=None,
                        date_from=None, date_to=None):
         """Get total count of inspections with filters"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        query = "SELECT COUNT(*) FROM inspections WHERE 1=1"
-        params = []
-
-        if device_id:
-            query += " AND device_id = ?"
-            params.append(device_id)
-
-        if result:
-            query += " AND result = ?"
-            params.append(result)
-
-        if date_from:
-            query += " AND date(timestamp) >= date(?)"
-            params.append(date_from)
+        where, params = self._filter_clause(device_id, result, date_from, date_to)
+        query = "SELECT COUNT(*) FROM inspections" + where
 
-        if date_to:
-            query += " AND date(timestamp) <= date(?)"
-            params.append(date_to)
-
-        cursor.execute(query, params)
-        count = cursor.fetchone()[0]
-        conn.close()
+        with self._lock:
+            count = self._get_connection().execute(query, params).fetchone()[0]
 
         return count
 
@@ -219,18 +280,18 @@ class HistoryManager:
         if record["image_path"] and os.path.exists(record["image_path"]):
             try:
                 os.remove(record["image_path"])
-                print(f"✓ Deleted image: {record['image_path']}")
+                log.info("✓ Deleted image: %s", record['image_path'])
             except Exception as e:
-                print(f"⚠️ Failed to delete image: {e}")
+                log.warning("⚠️ Failed to delete image: %s", e)
 
         # Delete from database
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM inspections WHERE id = ?", (record_id,))
-        conn.commit()
-        conn.close()
+        with self._lock:
+            conn = self._get_connection()
+            conn.execute("DELETE FROM inspections WHERE id = ?", (record_id,))
+            conn.commit()
+            self._stats_cache = None
 
-        print(f"✓ Deleted inspection #{record_id}")
+        log.info("✓ Deleted inspection #%s", record_id)
         return True
 
     def cleanup_old_records(self, days=30):
@@ -243,40 +304,38 @@ class HistoryManager:
         Returns:
             int: Number of deleted records
         """
-        cutoff_date = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
-
-        # Get old records to delete their images
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            SELECT id, image_path FROM inspections
-            WHERE date(timestamp) < date(?)
-        """, (cutoff_date,))
-        old_records = cursor.fetchall()
-
-        # Delete images
+        # Cutoff computed by SQLite (timestamps are stored in local time)
+        cutoff_modifier = f"-{int(days)} days"
+
+        with self._lock:
+            conn = self._get_connection()
+
+            # Collect the image files of the old records, then drop the rows
+            # with one bulk DELETE
+            image_paths = [row[0] for row in conn.execute("""
+                SELECT image_path FROM inspections
+                WHERE date(timestamp) < date('now', 'localtime', ?)
+                AND image_path IS NOT NULL
+            """, (cutoff_modifier,))]
+            deleted_db_count = conn.execute("""
+                DELETE FROM inspections WHERE date(timestamp) < date('now', 'localtime', ?)
+            """, (cutoff_modifier,)).rowcount
+            conn.commit()
+            self._stats_cache = None
+
+        # Delete images outside the lock so saves are not held up by file I/O
         deleted_count = 0
-        for record in old_records:
-            if record["image_path"] and os.path.exists(record["image_path"]):
-                try:
-                    os.remove(record["image_path"])
-                    deleted_count += 1
-                except Exception as e:
-                    print(f"⚠️ Failed to delete image: {e}")
-
-        # Delete from database
-        cursor.execute("""
-            DELETE FROM inspections WHERE date(timestamp) < date(?)
-        """, (cutoff_date,))
-
-        deleted_db_count = cursor.rowcount
-        conn.commit()
-        conn.close()
+        for image_path in image_paths:
+            try:
+                os.remove(image_path)
+                deleted_count += 1
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                log.warning("⚠️ Failed to delete image: %s", e)
 
-        print(f"✓ Cleaned up {deleted_db_count} records older than {days} days")
-        print(f"✓ Deleted {deleted_count} image files")
+        log.info("✓ Cleaned up %d records older than %d days", deleted_db_count, days)
+        log.info("✓ Deleted %d image files", deleted_count)
 
         return deleted_db_count
 
@@ -297,72 +356,91 @@ class HistoryManager:
         """
         import csv
 
-        records = self.get_inspections(
-            limit=10000,  # Export max 10000 records
-            device_id=device_id,
-            result=result,
-            date_from=date_from,
-            date_to=date_to
-        )
-
-        if not records:
-            print("⚠️ No records to export")
-            return 0
-
-        # Write to CSV
-        with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = [
-                'id', 'timestamp', 'device_id', 'image_id', 'result',
-                'station', 'inspection_name', 'image_path'
-            ]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-            writer.writeheader()
-            for record in records:
-                # Write only selected fields (exclude large JSON)
-                row = {key: record.get(key, '') for key in fieldnames}
-                writer.writerow(row)
-
-        print(f"✓ Exported {len(records)} records to {output_path}")
-        return len(records)
+        # Only the exported columns are read (not the large JSON), and rows
+        # are streamed from the cursor straight into the file
+        fieldnames = [
+            'id', 'timestamp', 'device_id', 'image_id', 'result',
+            'station', 'inspection_name', 'image_path'
+        ]
+        where, params = self._filter_clause(device_id, result, date_from, date_to)
+        query = (f"SELECT {', '.join(fieldnames)} FROM inspections" + where +
+                 " ORDER BY timestamp DESC LIMIT ?")
+        params.append(10000)  # Export max 10000 records
+
+        with self._lock:
+            cursor = self._get_connection().cursor()
+            cursor.arraysize = 500
+            cursor.execute(query, params)
+
+            first_row = cursor.fetchone()
+            if first_row is None:
+                log.warning("⚠️ No records to export")
+                return 0
+
+            # Write to CSV
+            with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(fieldnames)
+                writer.writerow(first_row)
+                count = 1
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    writer.writerows(rows)
+                    count += len(rows)
+
+        log.info("✓ Exported %d records to %s", count, output_path)
+        return count
 
     def get_statistics(self):
-        """Get statistics about inspections"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-
-        # Total count
-        cursor.execute("SELECT COUNT(*) FROM inspections")
-        total = cursor.fetchone()[0]
-
-        # Pass/Fail count
-        cursor.execute("""
-            SELECT result, COUNT(*) FROM inspections
-            GROUP BY result
-        """)
-        result_counts = dict(cursor.fetchall())
-
-        # Device counts
-        cursor.execute("""
-            SELECT device_id, COUNT(*) FROM inspections
-            GROUP BY device_id
-        """)
-        device_counts = dict(cursor.fetchall())
-
-        # Today's count
+        """
+        Get statistics about inspections
+
+        The result is cached until the database changes (own writes, or
+        another connection's commits as reported by PRAGMA data_version)
+        or the date rolls over.
+        """
         today = datetime.now().strftime("%Y-%m-%d")
-        cursor.execute("""
-            SELECT COUNT(*) FROM inspections
-            WHERE date(timestamp) = date(?)
-        """, (today,))
-        today_count = cursor.fetchone()[0]
-
-        conn.close()
-
-        return {
-            "total": total,
-            "pass": result_counts.get("pass", 0),
-            "fail": result_counts.get("fail", 0),
-            "devices": device_counts,
-            "today": today_count
-        }
+
+        with self._lock:
+            cursor = self._get_connection().cursor()
+
+            cursor.execute("PRAGMA data_version")
+            cache_key = (cursor.fetchone()[0], today)
+            if self._stats_cache is not None and self._stats_cache[0] == cache_key:
+                return dict(self._stats_cache[1])
+
+            # Total and Pass/Fail counts in one aggregate
+            cursor.execute("""
+                SELECT COUNT(*),
+                       COALESCE(SUM(result = 'pass'), 0),
+                       COALESCE(SUM(result = 'fail'), 0)
+                FROM inspections
+            """)
+            total, pass_count, fail_count = cursor.fetchone()
+
+            # Device counts
+            cursor.execute("""
+                SELECT device_id, COUNT(*) FROM inspections
+                GROUP BY device_id
+            """)
+            device_counts = {row[0]: row[1] for row in cursor.fetchall()}
+
+            # Today's count
+            cursor.execute("""
+                SELECT COUNT(*) FROM inspections
+                WHERE date(timestamp) = date(?)
+            """, (today,))
+            today_count = cursor.fetchone()[0]
+
+            stats = {
+                "total": total,
+                "pass": pass_count,
+                "fail": fail_count,
+                "devices": device_counts,
+                "today": today_count
+            }
+            self._stats_cache = (cache_key, stats)
+
+        return dict(stats)
@@ -25,15 +25,23 @@ except ImportError:
 from history_manager import HistoryManager
 import json
 
+# Use orjson for faster JSON parsing when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class HistoryWidget(QWidget):
     """Widget for displaying and managing inspection history"""
 
-    def __init__(self, parent=None):
+    def __init__(self, history_manager=None, parent=None):
         super().__init__(parent)
-        self.history_manager = HistoryManager()
+        # Share the caller's manager (one DB connection) when given
+        self.history_manager = history_manager or HistoryManager()
         self.current_page = 0
         self.page_size = 50
+        self._devices = ()  # Device IDs currently listed in device_combo
         self.init_ui()
         self.load_history()
 
@@ -230,31 +238,33 @@ class HistoryWidget(QWidget):
         self.prev_btn.setEnabled(self.current_page > 0)
         self.next_btn.setEnabled((self.current_page + 1) * self.page_size < total_count)
 
-        # Update statistics
-        self.update_statistics()
-
-        # Update device combo
-        self.update_device_combo()
+        # Update statistics and device combo from one statistics lookup
+        stats = self.history_manager.get_statistics()
+        self.update_statistics(stats)
+        self.update_device_combo(stats)
 
-    def update_statistics(self):
+    def update_statistics(self, stats=None):
         """Update statistics labels"""
-        stats = self.history_manager.get_statistics()
+        if stats is None:
+            stats = self.history_manager.get_statistics()
         self.stats_total_label.setText(f"Total: {stats['total']}")
         self.stats_pass_label.setText(f"✓ Pass: {stats['pass']}")
         self.stats_fail_label.setText(f"✗ Fail: {stats['fail']}")
         self.stats_today_label.setText(f"Today: {stats['today']}")
 
-    def update_device_combo(self):
+    def update_device_combo(self, stats=None):
         """Update device combo with available devices"""
-        stats = self.history_manager.get_statistics()
+        if stats is None:
+            stats = self.history_manager.get_statistics()
+        devices = tuple(device for device in stats["devices"] if device)
+        if devices == self._devices:
+            return  # Same devices as last refresh, keep the combo as is
+        self._devices = devices
         current_device = self.device_combo.currentText()
 
         self.device_combo.clear()
         self.device_combo.addItem("All")
-
-        for device in stats["devices"].keys():
-            if device:
-                self.device_combo.addItem(device)
+        self.device_combo.addItems(devices)
 
         # Restore selection
         index = self.device_combo.findText(current_device)
@@ -393,7 +403,10 @@ class HistoryDetailDialog(QDialog):
         # Rule results
         if self.record["rule_results"]:
             try:
-                rules = json.loads(self.record["rule_results"])
+                if orjson is not None:
+                    rules = orjson.loads(self.record["rule_results"])
+                else:
+                    rules = json.loads(self.record["rule_results"])
                 info_text += "<br><b>Rule Results:</b><br>"
                 for rule in rules:
                     rule_name = rule.get("Rule Name", "Unknown")
@@ -4,8 +4,14 @@ PyQt6/PySide6 GUI Application for triggering MVI inspections via MQTT
 """
 import sys
 import json
+import logging
 import os
+import queue
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
 
 # Try to import PyQt6, fallback to PySide6 if not available
 try:
@@ -15,8 +21,11 @@ try:
         QMessageBox, QGroupBox, QGridLayout, QStatusBar, QScrollArea, QTabWidget,
         QRadioButton, QCheckBox
     )
-    from PyQt6.QtCore import Qt, QTimer, QSize, QRectF, QPointF
-    from PyQt6.QtGui import QFont, QPalette, QColor, QPixmap, QPainter, QPen
+    from PyQt6.QtCore import (
+        Qt, QTimer, QSize, QRectF, QPointF, QSignalBlocker, QFileSystemWatcher,
+        QObject, QRunnable, QThreadPool, pyqtSignal
+    )
+    from PyQt6.QtGui import QFont, QPalette, QColor, QPixmap, QImage, QPainter, QPen
     print("Using PyQt6")
 except ImportError:
     from PySide6.QtWidgets import (
@@ -25,15 +34,442 @@ except ImportError:
         QMessageBox, QGroupBox, QGridLayout, QStatusBar, QScrollArea, QTabWidget,
         QRadioButton, QCheckBox
     )
-    from PySide6.QtCore import Qt, QTimer, QSize, QRectF, QPointF
-    from PySide6.QtGui import QFont, QPalette, QColor, QPixmap, QPainter, QPen
+    from PySide6.QtCore import (
+        Qt, QTimer, QSize, QRectF, QPointF, QSignalBlocker, QFileSystemWatcher,
+        QObject, QRunnable, QThreadPool, Signal as pyqtSignal
+    )
+    from PySide6.QtGui import QFont, QPalette, QColor, QPixmap, QImage, QPainter, QPen
     print("Using PySide6")
 
+# Use orjson for faster JSON parsing/serialization when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from mqtt_client import MQTTClient
 from history_manager import HistoryManager
 from history_widget import HistoryWidget
 
 
+log = logging.getLogger(__name__)
+
+# Metadata fields to display (in Thai), in display order
+# Each field can have multiple possible keys, matched exactly (case-sensitive);
+# earlier keys take priority over later ones
+METADATA_FIELDS = {
+    "Device ID": ["Device ID", "device_id", "DeviceID", "deviceId"],
+    "Image ID": ["ImageID", "image_id", "imageId", "Image ID"],
+    "Station": ["Station name", "station_name", "StationName", "station", "Station"],
+    "Inspection": ["Inspection name", "inspection_name", "InspectionName", "inspection"],
+    "วันที่": ["Capture date", "capture_date", "Date sent", "date"],
+    "เวลา": ["Capture time", "capture_time", "Time sent", "time"]
+}
+# Flat lookup: key -> (display label, alias rank); a lower rank is a preferred alias
+METADATA_KEY_MAP = {
+    sys.intern(key): (label, rank)
+    for label, keys in METADATA_FIELDS.items() for rank, key in enumerate(keys)
+}
+# Lowercased keys checked for the overall result, in priority order
+RESULT_KEYS = (sys.intern("overall result"), sys.intern("result"))
+# Nested structures searched after the main level
+# (MVI Server metadata, Alert structure, Inherited metadata, Generic metadata)
+METADATA_SECTIONS = ("mvidata", "Alert", "Inherited metadata", "metadata")
+# Rule result -> metadata panel line (%s is the rule's display name)
+RULE_RESULT_TEMPLATES = {
+    "pass": '  <span style="color: #28a745; font-weight: bold;">✓</span> %s<br>',  # Green
+    "fail": '  <span style="color: #dc3545; font-weight: bold;">✗</span> %s<br>',  # Red
+}
+RULE_RESULT_TEMPLATE_UNKNOWN = '  <span style="color: #6c757d; font-weight: bold;">?</span> %s<br>'  # Gray
+
+
+# Shared stylesheets (one string object per style instead of one per widget)
+STYLE_CONNECTED = (
+    "QLabel { background-color: #28a745; color: white; padding: 10px; "
+    "border-radius: 5px; font-weight: bold; }"
+)
+STYLE_DISCONNECTED = (
+    "QLabel { background-color: #dc3545; color: white; padding: 10px; "
+    "border-radius: 5px; font-weight: bold; }"
+)
+STYLE_DEVICE_LABEL = "QLabel { color: #0056b3; padding: 3px; }"
+STYLE_IMAGE_ID_LABEL = "QLabel { color: #495057; padding: 3px; }"
+STYLE_METADATA_LABEL = (
+    "QLabel { background-color: #f8f9fa; color: #212529; "
+    "border: 1px solid #dee2e6; border-radius: 5px; padding: 10px; }"
+)
+STYLE_IMAGE_SCROLL = (
+    "QScrollArea { background-color: #f8f9fa; border: 1px solid #dee2e6; border-radius: 5px; }"
+)
+# Widgets below are styled once; set_style_state() switches the [state="..."] rule
+STYLE_IMAGE_LABEL = (
+    "QLabel { background-color: #e9ecef; color: #6c757d; "
+    "border: 1px solid #dee2e6; border-radius: 5px; "
+    "padding: 20px; font-size: 12px; }"
+    'QLabel[state="loaded"] { padding: 0px; }'
+)
+STYLE_STATUS_LABEL = (
+    'QLabel[state="pass"] { background-color: #28a745; color: white; '
+    "border-radius: 8px; padding: 15px; }"
+    'QLabel[state="fail"] { background-color: #dc3545; color: white; '
+    "border-radius: 8px; padding: 15px; }"
+)
+
+# Smooth-scaled zoom levels kept per camera image / per fullscreen dialog
+SCALED_CACHE_SIZE = 8
+FULLSCREEN_SCALED_CACHE_SIZE = 4
+
+# Bounding box colors by score: high (>= 0.8), medium (>= 0.5), low
+BOX_COLORS = (
+    QColor(40, 167, 69),   # Green #28a745
+    QColor(255, 193, 7),   # Yellow #ffc107
+    QColor(220, 53, 69),   # Red #dc3545
+)
+
+
+def parse_inspection_result(data):
+    """
+    Extract everything the live view needs from an MVI result in one pass
+
+    Args:
+        data: JSON data from MQTT message
+
+    Returns:
+        SimpleNamespace: device_id, image_id, image_path, overall_result
+        ("pass"/"fail"/""), result_value, detected_objects, rule_results,
+        metadata ({label: value}, same precedence as METADATA_FIELDS) and the raw data
+    """
+    # Lowercased view of the top-level keys, used only for the result keys
+    # (case-insensitive); keys are interned so lookups with the interned
+    # RESULT_KEYS match by identity. Metadata aliases are matched exactly below
+    intern = sys.intern
+    lower_data = {intern(key.lower()): value for key, value in data.items() if isinstance(key, str)}
+
+    # Overall Result (fall back to "result")
+    overall_result = ""
+    for key in RESULT_KEYS:
+        overall_result = str(lower_data.get(key, "")).lower()
+        if overall_result in ("pass", "fail"):
+            break
+
+    result_value = lower_data.get(RESULT_KEYS[1])
+    result_value = result_value.lower() if isinstance(result_value, str) else "unknown"
+
+    # Metadata: main level first, then nested sections. A label takes its value
+    # from the first level that has any of its aliases; within that level the
+    # best-ranked alias (METADATA_FIELDS order) wins, whatever the key order
+    metadata = {}
+    nested_objects = [data]
+    nested_objects.extend(data.get(section, {}) for section in METADATA_SECTIONS)
+    for nested_obj in nested_objects:
+        if not isinstance(nested_obj, dict):
+            continue
+
+        level = {}  # label -> (rank, value) found at this level
+        for key, value in nested_obj.items():
+            if not value:
+                continue
+            entry = METADATA_KEY_MAP.get(key)
+            if entry is None:
+                continue
+            label, rank = entry
+            if label not in metadata and (label not in level or rank < level[label][0]):
+                level[label] = (rank, value)
+
+        for label, (rank, value) in level.items():
+            metadata[label] = value
+
+    rule_results = data.get("Rule Results", [])
+
+    return SimpleNamespace(
+        device_id=data.get("Device ID", ""),
+        image_id=data.get("Image ID", ""),
+        image_path=data.get("Image Path", ""),
+        overall_result=overall_result,
+        result_value=result_value,
+        detected_objects=data.get("Detected Objects", []),
+        rule_results=rule_results if isinstance(rule_results, list) else [],
+        metadata=metadata,
+        data=data
+    )
+
+
+@lru_cache(maxsize=None)
+def get_font(point_size, bold=False):
+    """Get a shared Arial QFont (created on first use, after QApplication)"""
+    if bold:
+        return QFont("Arial", point_size, QFont.Weight.Bold)
+    return QFont("Arial", point_size)
+
+
+def set_style_state(widget, state):
+    """Switch the widget's [state] stylesheet rule without re-parsing its stylesheet"""
+    if widget.property("state") == state:
+        return
+    widget.setProperty("state", state)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+
+
+def json_loads(data):
+    """Parse JSON from str or bytes (orjson if installed)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_pretty(obj):
+    """Serialize to indented UTF-8 JSON bytes (orjson if installed)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def has_drawable_boxes(detected_objects):
+    """Check whether any detected object has a box draw_bounding_boxes would draw"""
+    for obj in detected_objects:
+        if not isinstance(obj, dict):
+            continue
+        rectangle = obj.get("rectangle", {})
+        min_point = rectangle.get("min", {})
+        max_point = rectangle.get("max", {})
+        if (max_point.get("x", 0) > min_point.get("x", 0)
+                and max_point.get("y", 0) > min_point.get("y", 0)):
+            return True
+    return False
+
+
+def draw_bounding_boxes(image, detected_objects):
+    """
+    Draw bounding boxes, labels, and scores on image
+
+    Paints on a QImage (safe outside the GUI thread). The freshly decoded
+    image is drawn on directly instead of copying it first.
+    """
+    # QPainter needs a 32-bit format (JPEGs may decode as grayscale/indexed)
+    result_image = image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+    painter = QPainter(result_image)
+
+    try:
+        # Enable antialiasing for smoother lines
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+        # Pens, font and metrics are shared by every box on this image
+        box_pens = [(color, QPen(color, 3)) for color in BOX_COLORS]  # 3px thick line
+        text_pen = QPen(Qt.GlobalColor.white)
+        painter.setFont(QFont("Arial", 12, QFont.Weight.Bold))
+        metrics = painter.fontMetrics()
+        text_height = metrics.height() + 6
+
+        # Collect boxes per color and labels first, then draw each group in one pass
+        rects_by_color = [[] for _ in box_pens]
+        labels = []
+        for obj in detected_objects:
+            if not isinstance(obj, dict):
+                continue
+
+            # Get bounding box coordinates
+            rectangle = obj.get("rectangle", {})
+            min_point = rectangle.get("min", {})
+            max_point = rectangle.get("max", {})
+
+            x1 = min_point.get("x", 0)
+            y1 = min_point.get("y", 0)
+            x2 = max_point.get("x", 0)
+            y2 = max_point.get("y", 0)
+
+            # Get label and score
+            label = obj.get("label", "Unknown")
+            score = obj.get("score", 0.0)
+
+            # Calculate width and height
+            width = x2 - x1
+            height = y2 - y1
+
+            if width <= 0 or height <= 0:
+                continue
+
+            # Choose color based on score (red for low, yellow for medium, green for high)
+            if score >= 0.8:
+                level = 0
+            elif score >= 0.5:
+                level = 1
+            else:
+                level = 2
+
+            rects_by_color[level].append(QRectF(int(x1), int(y1), int(width), int(height)))
+
+            # Position label above box (or below if near top edge)
+            label_y = int(y1) - text_height if y1 > text_height + 5 else int(y1) + int(height) + text_height
+            labels.append((int(x1), label_y, f"{label} {score:.2f}", box_pens[level][0]))
+
+        # Draw bounding boxes: one drawRects call per color
+        for (color, pen), rects in zip(box_pens, rects_by_color):
+            if rects:
+                painter.setPen(pen)
+                painter.drawRects(rects)
+
+        # Draw labels on top of all boxes
+        painter.setPen(text_pen)
+        for x, label_y, label_text, color in labels:
+            text_width = metrics.horizontalAdvance(label_text) + 10
+
+            # Draw label background
+            painter.fillRect(x, label_y - text_height + 3, text_width, text_height, color)
+
+            # Draw label text
+            painter.drawText(x + 5, label_y - 3, label_text)
+
+    finally:
+        painter.end()
+
+    return result_image
+
+
+# Decoded inspection images keyed by (path, mtime, size), shared by pool workers
+DECODED_IMAGE_CACHE_BYTES = 200 * 1024 * 1024
+_decoded_images = OrderedDict()
+_decoded_images_bytes = 0
+_decoded_images_lock = threading.Lock()
+
+
+def load_cached_image(image_path):
+    """
+    Load a QImage, reusing the decoded copy if the file has not changed
+
+    QImage is implicitly shared, so painting on the returned image (or a
+    format conversion of it) detaches and leaves the cached copy clean.
+    """
+    global _decoded_images_bytes
+
+    stat = os.stat(image_path)
+    key = (image_path, stat.st_mtime_ns, stat.st_size)
+    with _decoded_images_lock:
+        image = _decoded_images.get(key)
+        if image is not None:
+            _decoded_images.move_to_end(key)
+            return QImage(image)
+
+    image = QImage(image_path)
+    size = image.sizeInBytes()
+    if image.isNull() or size > DECODED_IMAGE_CACHE_BYTES:
+        return image
+
+    with _decoded_images_lock:
+        if key not in _decoded_images:
+            _decoded_images[key] = image
+            _decoded_images_bytes += size
+            while _decoded_images_bytes > DECODED_IMAGE_CACHE_BYTES:
+                _, old = _decoded_images.popitem(last=False)
+                _decoded_images_bytes -= old.sizeInBytes()
+    return QImage(image)
+
+
+class ImageLoadSignals(QObject):
+    """Signals emitted by ImageLoadJob (queued to the GUI thread)"""
+
+    # camera_id, load token, QImage (None on error), parsed inspection result, error message
+    finished = pyqtSignal(str, int, object, object, str)
+
+
+class ImageLoadJob(QRunnable):
+    """Decode an inspection image and draw its bounding boxes in a worker thread"""
+
+    def __init__(self, signals, camera_id, token, image_path, detected_objects, data):
+        super().__init__()
+        self.signals = signals
+        self.camera_id = camera_id
+        self.token = token
+        self.image_path = image_path
+        self.detected_objects = detected_objects
+        self.data = data
+
+    def run(self):
+        """Load image (runs in QThreadPool)"""
+        image = None
+        error = ""
+        try:
+            image = load_cached_image(self.image_path)
+
+            # Draw bounding boxes if detected objects exist
+            detected_objects = self.detected_objects
+            if (not image.isNull() and detected_objects and isinstance(detected_objects, list)
+                    and has_drawable_boxes(detected_objects)):
+                image = draw_bounding_boxes(image, detected_objects)
+                log.debug("✓ วาด bounding boxes: %d วัตถุ", len(detected_objects))
+        except Exception as e:
+            image = None
+            error = str(e)
+
+        self.signals.finished.emit(self.camera_id, self.token, image, self.data, error)
+
+
+class HistorySaveQueue(QObject):
+    """Save inspections to history in order on a background thread"""
+
+    # Emitted after each batch is processed: written in one transaction, or
+    # retried row by row after a failure (queued to the GUI thread)
+    saved = pyqtSignal()
+
+    MAX_BATCH = 32  # Results written per transaction when saves pile up
+
+    def __init__(self, history_manager, parent=None):
+        super().__init__(parent)
+        self.history_manager = history_manager
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="history-save", daemon=True)
+        self._thread.start()
+
+    def put(self, data, image=None):
+        """Queue an inspection (image is a QImage, safe to save off the GUI thread)"""
+        self._queue.put((data, image))
+
+    def stop(self, timeout=5.0):
+        """
+        Finish pending saves and stop the worker thread
+
+        Returns:
+            bool: True if the worker finished, False if still saving after timeout
+        """
+        self._queue.put(None)
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _run(self):
+        """Worker loop: save whatever is queued as one batch"""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            while len(batch) < self.MAX_BATCH:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                self.history_manager.save_inspections(batch)
+            except Exception as e:
+                if len(batch) == 1:
+                    log.warning("⚠️ Failed to save to history: %s", e)
+                else:
+                    # Retry one by one so a single bad result doesn't drop the batch
+                    for data, image in batch:
+                        try:
+                            self.history_manager.save_inspection(data, image)
+                        except Exception as e:
+                            log.warning("⚠️ Failed to save to history: %s", e)
+            self.saved.emit()
+
+
 class AddTopicDialog(QDialog):
     """Dialog for adding new MQTT topic"""
 
@@ -73,19 +509,39 @@ class MVITriggerGUI(QMainWindow):
 
     def __init__(self):
         super().__init__()
+        self._loading_ui_state = True  # Suppress UI state saves during startup
         self.config_file = Path("config.json")
+        self._last_config_bytes = None  # Last bytes written to/read from config_file
+        self._config_mtime = None  # st_mtime_ns of config_file when last read/written
         self.config = self.load_config()
         self.mqtt_client = None
         self.history_manager = HistoryManager()  # Initialize history manager
+        self.history_queue = HistorySaveQueue(self.history_manager, self)
+
+        # Coalesce rapid UI state changes into a single config write
+        self._save_ui_timer = QTimer(self)
+        self._save_ui_timer.setSingleShot(True)
+        self._save_ui_timer.setInterval(250)
+        self._save_ui_timer.timeout.connect(self._do_save_ui_state)
+
         self.init_ui()
         self.load_ui_state()  # Load saved UI state (mode and selections)
+
+        # Reload config only when it is changed outside the app
+        self.config_watcher = QFileSystemWatcher([str(self.config_file)], self)
+        self.config_watcher.fileChanged.connect(self.on_config_file_changed)
+
         self.init_mqtt()
 
     def load_config(self):
         """Load configuration from JSON file"""
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(self.config_file, 'rb') as f:
+                raw = f.read()
+            config = json_loads(raw)
+            self._last_config_bytes = raw
+            self._config_mtime = self.config_file.stat().st_mtime_ns
+            return config
         except Exception as e:
             QMessageBox.critical(self, "Error", f"ไม่สามารถโหลด config.json: {e}")
             sys.exit(1)
@@ -93,12 +549,64 @@ class MVITriggerGUI(QMainWindow):
     def save_config(self):
         """Save configuration to JSON file"""
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            self._write_config()
         except Exception as e:
             QMessageBox.warning(self, "Warning", f"ไม่สามารถบันทึก config: {e}")
 
+    def _write_config(self):
+        """Write config atomically, skipping the write if content is unchanged"""
+        data = json_dumps_pretty(self.config)
+        if data == self._last_config_bytes:
+            return
+
+        # Write to temp file then replace, so config.json is never half-written
+        tmp_path = self.config_file.with_suffix(".json.tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, self.config_file)
+        self._last_config_bytes = data
+        self._config_mtime = self.config_file.stat().st_mtime_ns
+
+    def _reload_if_changed(self):
+        """Reload config only if config.json was modified outside this app"""
+        try:
+            mtime = self.config_file.stat().st_mtime_ns
+        except OSError:
+            return False
+        if mtime == self._config_mtime:
+            return False
+
+        raw = self.config_file.read_bytes()
+        self._config_mtime = mtime
+        if raw == self._last_config_bytes:
+            return False
+
+        try:
+            config = json_loads(raw)
+        except ValueError as e:
+            log.warning("⚠️ Ignoring invalid config.json change: %s", e)
+            return False
+
+        self.config = config
+        self._last_config_bytes = raw
+        self.update_topic_list()
+        self.update_checkbox_list()
+        self.statusBar.showMessage("โหลด config.json ใหม่", 3000)
+        return True
+
+    def on_config_file_changed(self, path):
+        """Handle external change of config.json"""
+        # Replacing the file (editors, os.replace) drops it from the watcher
+        if path not in self.config_watcher.files() and os.path.exists(path):
+            self.config_watcher.addPath(path)
+        self._reload_if_changed()
+
     def save_ui_state(self):
+        """Schedule a (debounced) save of UI state to config"""
+        if self._loading_ui_state:
+            return
+        self._save_ui_timer.start()
+
+    def _do_save_ui_state(self):
         """Save UI state (mode and selected topics) to config"""
         try:
             ui_state = {}
@@ -110,24 +618,20 @@ class MVITriggerGUI(QMainWindow):
             else:
                 ui_state["trigger_mode"] = "multiple"
                 # Save selected topics in multiple mode
-                selected = []
-                for checkbox in self.topic_checkboxes:
-                    if checkbox.isChecked():
-                        selected.append(checkbox.text())
-                ui_state["selected_topics"] = selected
+                ui_state["selected_topics"] = self.get_checked_topics()
 
             # Update config
             self.config["ui_state"] = ui_state
 
             # Save to file
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            self._write_config()
 
         except Exception as e:
-            print(f"⚠️ Failed to save UI state: {e}")
+            log.warning("⚠️ Failed to save UI state: %s", e)
 
     def load_ui_state(self):
         """Load UI state (mode and selected topics) from config"""
+        self._loading_ui_state = True
         try:
             ui_state = self.config.get("ui_state", {})
 
@@ -136,25 +640,33 @@ class MVITriggerGUI(QMainWindow):
             if mode == "multiple":
                 self.multi_mode_radio.setChecked(True)
 
-                # Load selected topics
-                selected_topics = ui_state.get("selected_topics", [])
-                for checkbox in self.topic_checkboxes:
-                    if checkbox.text() in selected_topics:
-                        checkbox.setChecked(True)
+                # Load selected topics (signals blocked: one count update, no per-checkbox save)
+                selected_topics = set(ui_state.get("selected_topics", []))
+                for topic, checkbox in self.topic_checkboxes.items():
+                    if topic in selected_topics:
+                        with QSignalBlocker(checkbox):
+                            checkbox.setChecked(True)
+                        self._checked_topics.add(topic)
+                self.update_selected_count()
             else:
                 self.single_mode_radio.setChecked(True)
 
                 # Load last selected topic in single mode
                 last_topic = ui_state.get("last_single_topic", "")
                 if last_topic:
-                    index = self.topic_combo.findText(last_topic)
+                    index = self._topic_index.get(last_topic, -1)
                     if index >= 0:
                         self.topic_combo.setCurrentIndex(index)
 
-            print(f"✓ UI state loaded: mode={mode}")
+            log.debug("✓ UI state loaded: mode=%s", mode)
 
         except Exception as e:
-            print(f"⚠️ Failed to load UI state: {e}")
+            log.warning("⚠️ Failed to load UI state: %s", e)
+        finally:
+            self._loading_ui_state = False
+
+        # Single save once loading is done (skipped if nothing changed)
+        self.save_ui_state()
 
     def init_ui(self):
         """Initialize user interface"""
@@ -192,8 +704,9 @@ class MVITriggerGUI(QMainWindow):
         self.tabs.addTab(self.live_widget, "🔴 Live")
 
         # Create History tab
-        self.history_widget = HistoryWidget()
+        self.history_widget = HistoryWidget(self.history_manager)
         self.tabs.addTab(self.history_widget, "📋 History")
+        self.tabs.currentChanged.connect(self.on_tab_changed)
 
         main_layout.addWidget(self.tabs)
 
@@ -228,10 +741,7 @@ class MVITriggerGUI(QMainWindow):
         connection_layout = QHBoxLayout()
 
         self.connection_label = QLabel("Disconnected")
-        self.connection_label.setStyleSheet(
-            "QLabel { background-color: #dc3545; color: white; padding: 10px; "
-            "border-radius: 5px; font-weight: bold; }"
-        )
+        self.connection_label.setStyleSheet(STYLE_DISCONNECTED)
 
         connection_layout.addWidget(self.connection_label)
         connection_group.setLayout(connection_layout)
@@ -265,7 +775,7 @@ class MVITriggerGUI(QMainWindow):
 
         self.topic_combo = QComboBox()
         self.topic_combo.setMinimumHeight(40)
-        self.topic_combo.setFont(QFont("Arial", 11))
+        self.topic_combo.setFont(get_font(11))
         self.update_topic_list()
         single_row.addWidget(self.topic_combo, 1)
 
@@ -287,7 +797,7 @@ class MVITriggerGUI(QMainWindow):
         multi_top_row.addWidget(QLabel("|"))
 
         self.selected_count_label = QLabel("Selected: 0/0")
-        self.selected_count_label.setFont(QFont("Arial", 10, QFont.Weight.Bold))
+        self.selected_count_label.setFont(get_font(10, bold=True))
         self.selected_count_label.setStyleSheet("QLabel { color: #0056b3; }")
         multi_top_row.addWidget(self.selected_count_label)
         multi_top_row.addStretch()
@@ -313,7 +823,8 @@ class MVITriggerGUI(QMainWindow):
         self.topics_checkbox_layout.setSpacing(5)
 
         # Create checkboxes for each topic
-        self.topic_checkboxes = []
+        self.topic_checkboxes = {}  # {topic: QCheckBox}, in topic list order
+        self._checked_topics = set()  # Topics whose checkbox is checked
         self.update_checkbox_list()
 
         self.topics_checkbox_layout.addStretch()
@@ -346,7 +857,7 @@ class MVITriggerGUI(QMainWindow):
         self.trigger_btn = QPushButton("🔘 TRIGGER")
         self.trigger_btn.setMinimumHeight(50)
         self.trigger_btn.setMinimumWidth(150)
-        self.trigger_btn.setFont(QFont("Arial", 14, QFont.Weight.Bold))
+        self.trigger_btn.setFont(get_font(14, bold=True))
         self.trigger_btn.setStyleSheet(
             "QPushButton { background-color: #007bff; color: white; "
             "border-radius: 5px; }"
@@ -367,45 +878,63 @@ class MVITriggerGUI(QMainWindow):
         # ========== Dual Camera Display (Side by Side) ==========
         cameras_layout = QHBoxLayout()
 
-        # Camera 1 (Left)
-        camera1_widgets = self.create_camera_viewer("Camera 1", "cam1")
-        self.cam1_image_id_label = camera1_widgets["image_id_label"]
-        self.cam1_device_label = camera1_widgets["device_label"]
-        self.cam1_zoom_reset_btn = camera1_widgets["zoom_reset_btn"]
-        self.cam1_image_scroll = camera1_widgets["image_scroll"]
-        self.cam1_image_label = camera1_widgets["image_label"]
-        self.cam1_metadata_label = camera1_widgets["metadata_label"]
-        self.cam1_status_label = camera1_widgets["status_label"]
-        cameras_layout.addWidget(camera1_widgets["group"])
-
-        # Camera 2 (Right)
-        camera2_widgets = self.create_camera_viewer("Camera 2", "cam2")
-        self.cam2_image_id_label = camera2_widgets["image_id_label"]
-        self.cam2_device_label = camera2_widgets["device_label"]
-        self.cam2_zoom_reset_btn = camera2_widgets["zoom_reset_btn"]
-        self.cam2_image_scroll = camera2_widgets["image_scroll"]
-        self.cam2_image_label = camera2_widgets["image_label"]
-        self.cam2_metadata_label = camera2_widgets["metadata_label"]
-        self.cam2_status_label = camera2_widgets["status_label"]
-        cameras_layout.addWidget(camera2_widgets["group"])
+        # Camera 1 (Left) and Camera 2 (Right)
+        # Per-camera widgets and state, looked up once per call by camera_id
+        self._cam_handles = {}
+        for camera_id, title in (("cam1", "Camera 1"), ("cam2", "Camera 2")):
+            widgets = self.create_camera_viewer(title, camera_id)
+            self._cam_handles[camera_id] = SimpleNamespace(
+                pixmap=None,
+                zoom=0.25,
+                device_id=None,
+                scaled_source=None,  # Pixmap/zoom/quality currently shown in image_label
+                scaled_zoom=None,
+                scaled_smooth=False,
+                scaled_cache=OrderedDict(),  # zoom percent -> smooth-scaled pixmap of 'pixmap'
+                load_token=0,  # Incremented per message; stale image loads are not shown
+                image_id_label=widgets["image_id_label"],
+                device_label=widgets["device_label"],
+                zoom_reset_btn=widgets["zoom_reset_btn"],
+                image_scroll=widgets["image_scroll"],
+                image_label=widgets["image_label"],
+                metadata_label=widgets["metadata_label"],
+                status_label=widgets["status_label"]
+            )
+            cameras_layout.addWidget(widgets["group"])
 
         live_layout.addLayout(cameras_layout)
 
-        # Initialize camera state variables
-        self.cam1_pixmap = None
-        self.cam1_zoom = 0.25
-        self.cam1_device_id = None
-
-        self.cam2_pixmap = None
-        self.cam2_zoom = 0.25
-        self.cam2_device_id = None
-
         self.latest_camera = None  # Track which camera received data last
 
         # Multi-topic trigger tracking
         self.pending_topics = set()  # Topics waiting for response
+        self._trigger_snapshot = ()  # Triggered topics, sorted once per trigger
         self.pending_responses = {}  # Collected responses {topic: response_data}
 
+        # Refresh a visible history tab at most once per second while saves arrive;
+        # a hidden tab is only marked dirty and refreshed when it is shown
+        self._history_dirty = False
+        self._history_refresh_timer = QTimer(self)
+        self._history_refresh_timer.setSingleShot(True)
+        self._history_refresh_timer.setInterval(1000)
+        self._history_refresh_timer.timeout.connect(self.refresh_history_if_visible)
+        self.history_queue.saved.connect(self.on_history_saved)
+
+        # Latest not-yet-shown result per camera {camera_id: data}
+        self._pending_display = {}
+        self._display_flush_scheduled = False
+
+        # Image decoding runs in QThreadPool; results come back through this object
+        self._image_loader = ImageLoadSignals(self)
+        self._image_loader.finished.connect(self.on_image_loaded)
+
+        # Re-render zoomed images smoothly once +/- clicks settle
+        self._zoom_settle_cams = set()
+        self._zoom_settle_timer = QTimer(self)
+        self._zoom_settle_timer.setSingleShot(True)
+        self._zoom_settle_timer.setInterval(120)
+        self._zoom_settle_timer.timeout.connect(self.on_zoom_settled)
+
         # Trigger timeout timer
         self.trigger_timer = QTimer()
         self.trigger_timer.timeout.connect(self.on_trigger_timeout)
@@ -421,42 +950,33 @@ class MVITriggerGUI(QMainWindow):
 
         # Device ID label
         device_label = QLabel("Device: -")
-        device_label.setFont(QFont("Arial", 9, QFont.Weight.Bold))
-        device_label.setStyleSheet("QLabel { color: #0056b3; padding: 3px; }")
+        device_label.setFont(get_font(9, bold=True))
+        device_label.setStyleSheet(STYLE_DEVICE_LABEL)
         top_row.addWidget(device_label)
 
         # Image ID label
         image_id_label = QLabel("Image: -")
-        image_id_label.setFont(QFont("Arial", 9, QFont.Weight.Bold))
-        image_id_label.setStyleSheet("QLabel { color: #495057; padding: 3px; }")
+        image_id_label.setFont(get_font(9, bold=True))
+        image_id_label.setStyleSheet(STYLE_IMAGE_ID_LABEL)
         top_row.addWidget(image_id_label)
 
         top_row.addStretch()
 
-        # Zoom controls
-        zoom_out_btn = QPushButton("🔍-")
-        zoom_out_btn.setMaximumWidth(45)
-        zoom_out_btn.setToolTip("Zoom Out")
-        zoom_out_btn.clicked.connect(lambda: self.camera_zoom_out(camera_id))
-        top_row.addWidget(zoom_out_btn)
-
-        zoom_reset_btn = QPushButton("25%")
-        zoom_reset_btn.setMaximumWidth(55)
-        zoom_reset_btn.setToolTip("Reset Zoom to 25%")
-        zoom_reset_btn.clicked.connect(lambda: self.camera_zoom_reset(camera_id))
-        top_row.addWidget(zoom_reset_btn)
-
-        zoom_in_btn = QPushButton("🔍+")
-        zoom_in_btn.setMaximumWidth(45)
-        zoom_in_btn.setToolTip("Zoom In")
-        zoom_in_btn.clicked.connect(lambda: self.camera_zoom_in(camera_id))
-        top_row.addWidget(zoom_in_btn)
-
-        fullscreen_btn = QPushButton("⛶")
-        fullscreen_btn.setMaximumWidth(45)
-        fullscreen_btn.setToolTip("Full Screen")
-        fullscreen_btn.clicked.connect(lambda: self.camera_show_fullscreen(camera_id))
-        top_row.addWidget(fullscreen_btn)
+        # Zoom controls: (key, text, max width, tooltip, handler)
+        buttons = {}
+        for key, text, max_width, tooltip, handler in (
+            ("zoom_out", "🔍-", 45, "Zoom Out", self.camera_zoom_out),
+            ("zoom_reset", "25%", 55, "Reset Zoom to 25%", self.camera_zoom_reset),
+            ("zoom_in", "🔍+", 45, "Zoom In", self.camera_zoom_in),
+            ("fullscreen", "⛶", 45, "Full Screen", self.camera_show_fullscreen),
+        ):
+            button = QPushButton(text)
+            button.setMaximumWidth(max_width)
+            button.setToolTip(tooltip)
+            button.clicked.connect(lambda checked=False, h=handler: h(camera_id))
+            top_row.addWidget(button)
+            buttons[key] = button
+        zoom_reset_btn = buttons["zoom_reset"]
 
         layout.addLayout(top_row)
 
@@ -464,7 +984,8 @@ class MVITriggerGUI(QMainWindow):
         status_label = QLabel()
         status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         status_label.setMinimumHeight(80)
-        status_label.setFont(QFont("Arial", 32, QFont.Weight.Bold))
+        status_label.setFont(get_font(32, bold=True))
+        status_label.setStyleSheet(STYLE_STATUS_LABEL)
         status_label.setVisible(False)  # Hidden by default
         layout.addWidget(status_label)
 
@@ -475,11 +996,8 @@ class MVITriggerGUI(QMainWindow):
         metadata_label = QLabel("ยังไม่มีข้อมูล")
         metadata_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
         metadata_label.setWordWrap(True)
-        metadata_label.setFont(QFont("Arial", 9))
-        metadata_label.setStyleSheet(
-            "QLabel { background-color: #f8f9fa; color: #212529; "
-            "border: 1px solid #dee2e6; border-radius: 5px; padding: 10px; }"
-        )
+        metadata_label.setFont(get_font(9))
+        metadata_label.setStyleSheet(STYLE_METADATA_LABEL)
         metadata_label.setMinimumWidth(180)
         metadata_label.setMaximumWidth(200)
         metadata_label.setMinimumHeight(350)
@@ -489,18 +1007,12 @@ class MVITriggerGUI(QMainWindow):
         image_scroll = QScrollArea()
         image_scroll.setWidgetResizable(True)
         image_scroll.setMinimumHeight(350)
-        image_scroll.setStyleSheet(
-            "QScrollArea { background-color: #f8f9fa; border: 1px solid #dee2e6; border-radius: 5px; }"
-        )
+        image_scroll.setStyleSheet(STYLE_IMAGE_SCROLL)
 
         # Image label
         image_label = QLabel("ยังไม่มีภาพ")
         image_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        image_label.setStyleSheet(
-            "QLabel { background-color: #e9ecef; color: #6c757d; "
-            "border: 1px solid #dee2e6; border-radius: 5px; "
-            "padding: 20px; font-size: 12px; }"
-        )
+        image_label.setStyleSheet(STYLE_IMAGE_LABEL)
         image_label.setMinimumSize(400, 300)
         image_label.setScaledContents(False)
 
@@ -523,24 +1035,52 @@ class MVITriggerGUI(QMainWindow):
 
     def update_topic_list(self):
         """Update topic combo box with current topics"""
+        topics = self.config.get("topics", [])
+
+        # Rebuild without emitting a currentIndexChanged per item
+        self.topic_combo.blockSignals(True)
         self.topic_combo.clear()
-        self.topic_combo.addItems(self.config.get("topics", []))
+        self.topic_combo.addItems(topics)
+        self.topic_combo.blockSignals(False)
+
+        # Topic -> combo index, avoids linear findText() scans
+        self._topic_index = {topic: i for i, topic in enumerate(topics)}
 
     def update_checkbox_list(self):
         """Update checkbox list with current topics"""
-        # Clear existing checkboxes
-        for checkbox in self.topic_checkboxes:
+        new_topics = list(self.config.get("topics", []))
+        new_topic_set = set(new_topics)
+
+        # Batch layout invalidation into a single relayout
+        self.topics_checkbox_layout.setEnabled(False)
+
+        # Remove checkboxes for topics that no longer exist
+        for topic in set(self.topic_checkboxes) - new_topic_set:
+            checkbox = self.topic_checkboxes.pop(topic)
+            self._checked_topics.discard(topic)
             self.topics_checkbox_layout.removeWidget(checkbox)
             checkbox.deleteLater()
-        self.topic_checkboxes.clear()
 
-        # Create new checkboxes
-        for topic in self.config.get("topics", []):
-            checkbox = QCheckBox(topic)
-            checkbox.setFont(QFont("Arial", 10))
-            checkbox.stateChanged.connect(self.on_topic_selection_changed)
-            self.topics_checkbox_layout.insertWidget(len(self.topic_checkboxes), checkbox)
-            self.topic_checkboxes.append(checkbox)
+        # Reuse existing checkboxes, create only the new ones, and move any
+        # whose position no longer matches the (possibly reordered) topic list
+        layout = self.topics_checkbox_layout
+        checkboxes = {}
+        for index, topic in enumerate(new_topics):
+            checkbox = self.topic_checkboxes.get(topic)
+            if checkbox is None:
+                checkbox = QCheckBox(topic)
+                checkbox.setFont(get_font(10))
+                checkbox.stateChanged.connect(
+                    lambda state, t=topic: self.on_topic_selection_changed(t, state)
+                )
+                layout.insertWidget(index, checkbox)
+            elif layout.indexOf(checkbox) != index:
+                layout.removeWidget(checkbox)
+                layout.insertWidget(index, checkbox)
+            checkboxes[topic] = checkbox
+        self.topic_checkboxes = checkboxes
+
+        self.topics_checkbox_layout.setEnabled(True)
 
         self.update_selected_count()
 
@@ -559,23 +1099,37 @@ class MVITriggerGUI(QMainWindow):
         """Handle Select All checkbox state change"""
         is_checked = state == Qt.CheckState.Checked.value
 
-        # Block signals to avoid triggering update for each checkbox
-        for checkbox in self.topic_checkboxes:
-            checkbox.blockSignals(True)
-            checkbox.setChecked(is_checked)
-            checkbox.blockSignals(False)
+        # Block signals to avoid triggering update for each checkbox,
+        # and suspend repaints so the whole list repaints once
+        self.topics_checkbox_widget.setUpdatesEnabled(False)
+        try:
+            for checkbox in self.topic_checkboxes.values():
+                with QSignalBlocker(checkbox):
+                    checkbox.setChecked(is_checked)
+        finally:
+            self.topics_checkbox_widget.setUpdatesEnabled(True)
 
+        self._checked_topics = set(self.topic_checkboxes) if is_checked else set()
         self.update_selected_count()
         self.save_ui_state()
 
-    def on_topic_selection_changed(self):
+    def on_topic_selection_changed(self, topic, state):
         """Handle individual topic checkbox state change"""
+        if state == Qt.CheckState.Checked.value:
+            self._checked_topics.add(topic)
+        else:
+            self._checked_topics.discard(topic)
+
         self.update_selected_count()
         self.save_ui_state()
 
+    def get_checked_topics(self):
+        """Get checked topics in topic list order (no per-checkbox Qt calls)"""
+        return [topic for topic in self.topic_checkboxes if topic in self._checked_topics]
+
     def update_selected_count(self):
         """Update the selected count label"""
-        selected_count = sum(1 for cb in self.topic_checkboxes if cb.isChecked())
+        selected_count = len(self._checked_topics)
         total_count = len(self.topic_checkboxes)
         self.selected_count_label.setText(f"Selected: {selected_count}/{total_count}")
 
@@ -604,7 +1158,7 @@ class MVITriggerGUI(QMainWindow):
                     self.save_config()
                     self.update_topic_list()
                     self.update_checkbox_list()
-                    self.topic_combo.setCurrentText(new_topic)
+                    self.topic_combo.setCurrentIndex(self._topic_index[new_topic])
                     self.statusBar.showMessage(f"เพิ่ม topic: {new_topic}", 3000)
                 else:
                     QMessageBox.warning(self, "Warning", "Topic นี้มีอยู่แล้ว")
@@ -635,11 +1189,14 @@ class MVITriggerGUI(QMainWindow):
             qos=mqtt_config.get("qos", 1)
         )
 
-        # Connect signals
-        self.mqtt_client.connected.connect(self.on_mqtt_connected)
-        self.mqtt_client.disconnected.connect(self.on_mqtt_disconnected)
-        self.mqtt_client.message_received.connect(self.on_mqtt_message)
-        self.mqtt_client.connection_error.connect(self.on_mqtt_error)
+        # Connect signals (emitted on the paho network thread; always queued so
+        # every slot below runs on the GUI thread)
+        queued = Qt.ConnectionType.QueuedConnection
+        self.mqtt_client.connected.connect(self.on_mqtt_connected, queued)
+        self.mqtt_client.disconnected.connect(self.on_mqtt_disconnected, queued)
+        self.mqtt_client.message_received.connect(self.on_mqtt_message, queued)
+        self.mqtt_client.message_parsed.connect(self.on_mqtt_message_parsed, queued)
+        self.mqtt_client.connection_error.connect(self.on_mqtt_error, queued)
 
         # Subscribe to result topic
         subscribe_topic = self.config.get("subscribe_topic", "mvi/+/result")
@@ -651,20 +1208,18 @@ class MVITriggerGUI(QMainWindow):
     def on_mqtt_connected(self):
         """Callback when MQTT connected"""
         self.connection_label.setText("Connected")
-        self.connection_label.setStyleSheet(
-            "QLabel { background-color: #28a745; color: white; padding: 10px; "
-            "border-radius: 5px; font-weight: bold; }"
-        )
+        # Only re-apply (and re-parse) the stylesheet when the state actually flips
+        if self.connection_label.styleSheet() != STYLE_CONNECTED:
+            self.connection_label.setStyleSheet(STYLE_CONNECTED)
         self.trigger_btn.setEnabled(True)
         self.statusBar.showMessage("เชื่อมต่อ MQTT สำเร็จ", 3000)
 
     def on_mqtt_disconnected(self):
         """Callback when MQTT disconnected"""
         self.connection_label.setText("Disconnected")
-        self.connection_label.setStyleSheet(
-            "QLabel { background-color: #dc3545; color: white; padding: 10px; "
-            "border-radius: 5px; font-weight: bold; }"
-        )
+        # Only re-apply (and re-parse) the stylesheet when the state actually flips
+        if self.connection_label.styleSheet() != STYLE_DISCONNECTED:
+            self.connection_label.setStyleSheet(STYLE_DISCONNECTED)
         self.trigger_btn.setEnabled(False)
         self.statusBar.showMessage("MQTT ถูกตัดการเชื่อมต่อ")
 
@@ -674,87 +1229,77 @@ class MVITriggerGUI(QMainWindow):
         self.statusBar.showMessage(f"Error: {error_msg}")
 
     def on_mqtt_message(self, topic, payload):
-        """Callback when MQTT message received"""
-        try:
-            # Try to parse JSON
-            data = json.loads(payload)
-
-            # IGNORE trigger messages (echo from our own trigger commands)
-            if "action" in data and data.get("action") == "trigger":
-                print(f"🔇 Ignoring trigger message echo from topic: {topic}")
-                return  # Don't process trigger messages
-
-            # FILTER incomplete messages (always, regardless of session state)
-            # Check if message has minimum required identification data
-            has_device_id = bool(data.get("Device ID", "").strip())
-            has_image_path = bool(data.get("Image Path", "").strip())
-            has_image_id = bool(data.get("Image ID", "").strip())
-
-            # Ignore messages without ANY essential identification data
-            if not (has_device_id or has_image_path or has_image_id):
-                print(f"🔇 Ignoring incomplete message from {topic} (no Device ID, Image Path, or Image ID)")
-                return
-
-            # Debug: Print received JSON to console
-            print("\n" + "="*60)
-            print(f"📨 MQTT Message received from topic: {topic}")
-            print("="*60)
-            print(json.dumps(data, indent=2, ensure_ascii=False))
-            print("="*60 + "\n")
-
-            # Extract and display image FIRST (metadata and status will be updated inside display_image)
-            self.display_image(data)
-
-            # Track response for multi-topic trigger (AFTER displaying)
-            # Use flexible response counting instead of strict topic matching
-            if hasattr(self, 'expected_response_count') and self.expected_response_count > 0:
-                # Check if this is a valid inspection result (not external noise)
-                is_valid_result = False
-                device_id = data.get("Device ID", "")
-
-                # Valid result criteria:
-                # 1. Has "Overall Result" field
-                # 2. Either has Device ID or Image Path (not empty messages)
-                if "Overall Result" in data:
-                    if device_id or data.get("Image Path") or data.get("Image ID"):
-                        is_valid_result = True
-
-                        # Check if this device already responded (avoid counting duplicates)
-                        if device_id and device_id in self.devices_received_in_session:
-                            is_valid_result = False
-                            print(f"ℹ️ Duplicate response from device {device_id}, ignoring")
-                        elif device_id:
-                            self.devices_received_in_session.add(device_id)
-
-                if is_valid_result:
-                    self.received_response_count += 1
-                    result_value = self.extract_result_value(data)
-
-                    print(f"✓ Valid inspection result received from {topic}")
-                    print(f"  Device: {device_id or 'unknown'}")
-                    print(f"  Result: {result_value}")
-                    print(f"  Progress: {self.received_response_count}/{self.expected_response_count}")
-
-                    # Check if all expected responses received
-                    if self.received_response_count >= self.expected_response_count:
-                        print("✓ All expected responses received!")
-                        self.trigger_timer.stop()
-                        self.reset_trigger_button()
-                else:
-                    print(f"ℹ️ Message from {topic} doesn't match valid result criteria (likely external message or duplicate)")
-
-        except json.JSONDecodeError:
-            # Not JSON, just log it
-            print(f"⚠️ Non-JSON message: {payload}")
-            self.statusBar.showMessage(f"ได้รับข้อความจาก {topic}", 3000)
-
-    def extract_result_value(self, data):
-        """Extract result value from MVI response data"""
-        # Try to find result field (case-insensitive)
-        for key in data.keys():
-            if key.lower() == "result":
-                return data[key].lower() if isinstance(data[key], str) else "unknown"
-        return "unknown"
+        """Callback when non-JSON MQTT message received"""
+        # Not JSON, just log it
+        log.debug("⚠️ Non-JSON message: %s", payload)
+        self.statusBar.showMessage(f"ได้รับข้อความจาก {topic}", 3000)
+
+    def on_mqtt_message_parsed(self, topic, data):
+        """Callback when MQTT message received (JSON already parsed off the GUI thread)"""
+        # IGNORE trigger messages (echo from our own trigger commands)
+        if "action" in data and data.get("action") == "trigger":
+            log.debug("🔇 Ignoring trigger message echo from topic: %s", topic)
+            return  # Don't process trigger messages
+
+        # Read the fields used below once; display and status reuse this
+        parsed = parse_inspection_result(data)
+
+        # FILTER incomplete messages (always, regardless of session state)
+        # Check if message has minimum required identification data
+        has_device_id = bool(parsed.device_id.strip())
+        has_image_path = bool(parsed.image_path.strip())
+        has_image_id = bool(parsed.image_id.strip())
+
+        # Ignore messages without ANY essential identification data
+        if not (has_device_id or has_image_path or has_image_id):
+            log.debug("🔇 Ignoring incomplete message from %s (no Device ID, Image Path, or Image ID)", topic)
+            return
+
+        # Debug: Log received JSON (skip the pretty-print entirely unless DEBUG is on)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("📨 MQTT Message received from topic: %s\n%s",
+                      topic, json_dumps_pretty(data).decode('utf-8'))
+
+        # Extract and display image FIRST (metadata and status will be updated inside display_image)
+        self.display_image(parsed)
+
+        # Track response for multi-topic trigger (AFTER displaying)
+        # Use flexible response counting instead of strict topic matching
+        if hasattr(self, 'expected_response_count') and self.expected_response_count > 0:
+            # Check if this is a valid inspection result (not external noise)
+            is_valid_result = False
+            device_id = parsed.device_id
+
+            # Valid result criteria:
+            # 1. Has "Overall Result" field
+            # 2. Either has Device ID or Image Path (not empty messages)
+            if "Overall Result" in data:
+                if device_id or parsed.image_path or parsed.image_id:
+                    is_valid_result = True
+
+                    # Check if this device already responded (avoid counting duplicates)
+                    if device_id and device_id in self.devices_received_in_session:
+                        is_valid_result = False
+                        log.debug("ℹ️ Duplicate response from device %s, ignoring", device_id)
+                    elif device_id:
+                        self.devices_received_in_session.add(device_id)
+
+            if is_valid_result:
+                self.received_response_count += 1
+                result_value = parsed.result_value
+
+                log.info("✓ Valid inspection result received from %s", topic)
+                log.debug("  Device: %s\n  Result: %s\n  Progress: %d/%d",
+                          device_id or 'unknown', result_value,
+                          self.received_response_count, self.expected_response_count)
+
+                # Check if all expected responses received
+                if self.received_response_count >= self.expected_response_count:
+                    log.info("✓ All expected responses received!")
+                    self.trigger_timer.stop()
+                    self.reset_trigger_button()
+            else:
+                log.debug("ℹ️ Message from %s doesn't match valid result criteria (likely external message or duplicate)", topic)
 
     def trigger_inspection(self):
         """Trigger MVI inspection (single or multiple topics)"""
@@ -770,9 +1315,7 @@ class MVITriggerGUI(QMainWindow):
             topics_to_trigger = [current_topic]
         else:
             # Multiple topics mode
-            for checkbox in self.topic_checkboxes:
-                if checkbox.isChecked():
-                    topics_to_trigger.append(checkbox.text())
+            topics_to_trigger = self.get_checked_topics()
 
             if len(topics_to_trigger) == 0:
                 QMessageBox.warning(self, "Warning", "กรุณาเลือกอย่างน้อย 1 topic")
@@ -781,6 +1324,7 @@ class MVITriggerGUI(QMainWindow):
         # Initialize pending topics tracking
         self.pending_topics = set(topics_to_trigger)
         self.pending_responses = {}
+        self._trigger_snapshot = tuple(sorted(self.pending_topics))
 
         # Track expected response count for flexible topic matching
         self.expected_response_count = len(topics_to_trigger)
@@ -794,32 +1338,34 @@ class MVITriggerGUI(QMainWindow):
         # Update button text
         if len(topics_to_trigger) == 1:
             self.trigger_btn.setText("⏳ กำลังตรวจสอบ")
-            print(f"🔘 Button text set to: '⏳ กำลังตรวจสอบ'")
+            log.debug("🔘 Button text set to: '⏳ กำลังตรวจสอบ'")
         else:
             self.trigger_btn.setText(f"⏳ กำลังตรวจสอบ ({len(topics_to_trigger)} topics)")
-            print(f"🔘 Button text set to: '⏳ กำลังตรวจสอบ ({len(topics_to_trigger)} topics)'")
+            log.debug("🔘 Button text set to: '⏳ กำลังตรวจสอบ (%d topics)'", len(topics_to_trigger))
 
         self.trigger_btn.setEnabled(False)  # Disable during inspection
-        print(f"🔘 Button disabled: {not self.trigger_btn.isEnabled()}")
+        log.debug("🔘 Button disabled: %s", not self.trigger_btn.isEnabled())
 
         # Start timeout timer (30 seconds)
         self.trigger_timer.start(30000)  # 30000ms = 30 seconds
-        print(f"⏱️ Timeout timer started: 30 seconds")
+        log.debug("⏱️ Timeout timer started: 30 seconds")
 
         # Prepare trigger message
         trigger_msg = {
             "action": "trigger"
         }
 
-        # Publish trigger to all selected topics
+        # Publish trigger to all selected topics (payload encoded once)
+        results = self.mqtt_client.publish_batch(
+            [(topic, trigger_msg) for topic in topics_to_trigger]
+        )
         success_count = 0
-        for topic in topics_to_trigger:
-            success = self.mqtt_client.publish(topic, trigger_msg)
+        for topic, success in zip(topics_to_trigger, results):
             if success:
                 success_count += 1
-                print(f"📤 Trigger sent to: {topic}")
+                log.debug("📤 Trigger sent to: %s", topic)
             else:
-                print(f"❌ Failed to send trigger to: {topic}")
+                log.error("❌ Failed to send trigger to: %s", topic)
                 # Remove from pending if failed to send
                 self.pending_topics.discard(topic)
 
@@ -841,67 +1387,28 @@ class MVITriggerGUI(QMainWindow):
             self.pending_topics.clear()
             self.pending_responses.clear()
 
-    def update_camera_status(self, camera_id, data):
+    def update_camera_status(self, camera_id, parsed):
         """Update status label for specific camera based on Overall Result"""
-        # Get Overall Result
-        result = data.get("Overall Result", data.get("result", "")).lower()
+        result = parsed.overall_result
 
         # Get the appropriate status label
-        if camera_id == "cam1":
-            status_label = self.cam1_status_label
-        else:  # cam2
-            status_label = self.cam2_status_label
+        status_label = self._cam_handles[camera_id].status_label
 
         # Update status based on result
+        # Don't reset button here - let on_mqtt_message_parsed() handle it when all topics received
+        # Button will be reset by on_mqtt_message_parsed() or on_trigger_timeout()
         if result == "pass":
             status_label.setText("✓ PASS")
-            status_label.setStyleSheet(
-                "QLabel { background-color: #28a745; color: white; "
-                "border-radius: 8px; padding: 15px; }"
-            )
+            set_style_state(status_label, "pass")
             status_label.setVisible(True)
-            print(f"✓ {camera_id.upper()}: PASS")
-            # Don't reset button here - let on_mqtt_message() handle it when all topics received
+            log.debug("✓ %s: PASS", camera_id.upper())
         elif result == "fail":
             status_label.setText("✗ FAIL")
-            status_label.setStyleSheet(
-                "QLabel { background-color: #dc3545; color: white; "
-                "border-radius: 8px; padding: 15px; }"
-            )
+            set_style_state(status_label, "fail")
             status_label.setVisible(True)
-            print(f"✗ {camera_id.upper()}: FAIL")
-            # Don't reset button here - let on_mqtt_message() handle it when all topics received
+            log.debug("✗ %s: FAIL", camera_id.upper())
         else:
-            # Try case-insensitive search
-            found = False
-            for key in data.keys():
-                if key.lower() in ["overall result", "result"]:
-                    result_val = str(data[key]).lower()
-                    if result_val == "pass":
-                        status_label.setText("✓ PASS")
-                        status_label.setStyleSheet(
-                            "QLabel { background-color: #28a745; color: white; "
-                            "border-radius: 8px; padding: 15px; }"
-                        )
-                        status_label.setVisible(True)
-                        print(f"✓ {camera_id.upper()}: PASS")
-                        found = True
-                        break
-                    elif result_val == "fail":
-                        status_label.setText("✗ FAIL")
-                        status_label.setStyleSheet(
-                            "QLabel { background-color: #dc3545; color: white; "
-                            "border-radius: 8px; padding: 15px; }"
-                        )
-                        status_label.setVisible(True)
-                        print(f"✗ {camera_id.upper()}: FAIL")
-                        found = True
-                        break
-
-            # Don't reset button here - let on_mqtt_message() handle it when all topics received
-            # Button will be reset by on_mqtt_message() or on_trigger_timeout()
-            if not found:
-                print(f"⚠️ {camera_id.upper()}: No result field found")
+            log.debug("⚠️ %s: No result field found", camera_id.upper())
 
     def reset_trigger_button(self):
         """Reset trigger button to default state"""
@@ -921,7 +1428,7 @@ class MVITriggerGUI(QMainWindow):
             self.expected_response_count = 0
             self.received_response_count = 0
 
-        print("🔄 Trigger button reset and session tracking cleared")
+        log.debug("🔄 Trigger button reset and session tracking cleared")
 
     def on_trigger_timeout(self):
         """Handle trigger timeout (no response received)"""
@@ -929,7 +1436,7 @@ class MVITriggerGUI(QMainWindow):
         expected = getattr(self, 'expected_response_count', 0)
         received = getattr(self, 'received_response_count', 0)
 
-        print(f"⏱️ Trigger timeout - Received {received}/{expected} responses")
+        log.info("⏱️ Trigger timeout - Received %d/%d responses", received, expected)
 
         # Only show timeout if we didn't receive enough responses
         if received < expected:
@@ -959,7 +1466,7 @@ class MVITriggerGUI(QMainWindow):
             self.expected_response_count = 0
             self.received_response_count = 0
         else:
-            print("✓ All responses already received, ignoring timeout")
+            log.debug("✓ All responses already received, ignoring timeout")
 
     def show_timeout_details_popup(self):
         """Show detailed timeout popup with received/missing topics"""
@@ -978,23 +1485,25 @@ class MVITriggerGUI(QMainWindow):
             msg_box.setText(f"ได้รับผลลัพธ์: {received}/{expected} topics")
 
         # Build details message
-        details = ""
+        details = []
 
         # Show what we got
         if received > 0:
-            details += f"✓ ได้รับผลลัพธ์: {received} response(s)\n\n"
+            details.append(f"✓ ได้รับผลลัพธ์: {received} response(s)\n\n")
 
         # Show what's missing
         if missing > 0:
-            details += f"✗ ไม่ได้รับผลลัพธ์ (Timeout): {missing} response(s)\n"
-            if hasattr(self, 'pending_topics') and len(self.pending_topics) > 0:
-                details += "Topics ที่รอ:\n"
-                for topic in sorted(self.pending_topics):
-                    details += f"  ⏱ {topic}\n"
-            details += "\n"
+            details.append(f"✗ ไม่ได้รับผลลัพธ์ (Timeout): {missing} response(s)\n")
+            # Snapshot is already sorted; keep the topics still pending
+            pending = self.pending_topics
+            waiting = [t for t in self._trigger_snapshot if t in pending]
+            if waiting:
+                details.append("Topics ที่รอ:\n")
+                details.extend(f"  ⏱ {topic}\n" for topic in waiting)
+            details.append("\n")
 
         # Troubleshooting guide
-        details += (
+        details.append(
             "กรุณาตรวจสอบ topics ที่ไม่ได้รับผล:\n\n"
             "1. ตรวจสอบการเชื่อมต่อ MQTT\n"
             "   - MQTT Broker ทำงานอยู่หรือไม่\n"
@@ -1006,147 +1515,100 @@ class MVITriggerGUI(QMainWindow):
             "   - Model พร้อมใช้งาน"
         )
 
-        msg_box.setInformativeText(details)
+        msg_box.setInformativeText("".join(details))
         msg_box.setStandardButtons(QMessageBox.StandardButton.Ok)
         msg_box.exec()
 
-    def display_metadata(self, camera_id, data):
+    def display_metadata(self, camera_id, parsed):
         """Display metadata from MVI inspection result for specific camera"""
-        # Define metadata fields to display (in Thai)
-        # Each field can have multiple possible keys (case-insensitive)
-        metadata_fields = {
-            "Device ID": ["Device ID", "device_id", "DeviceID", "deviceId"],
-            "Image ID": ["ImageID", "image_id", "imageId", "Image ID"],
-            "Station": ["Station name", "station_name", "StationName", "station", "Station"],
-            "Inspection": ["Inspection name", "inspection_name", "InspectionName", "inspection"],
-            "วันที่": ["Capture date", "capture_date", "Date sent", "date"],
-            "เวลา": ["Capture time", "capture_time", "Time sent", "time"]
-        }
-
-        # Build metadata display text
-        metadata_text = ""
+        # Build metadata display text (HTML fragments joined once at the end)
+        parts = []
         metadata_found = False
+        found = parsed.metadata
 
-        # Collect all possible nested structures
-        nested_objects = [
-            data,  # Main level
-            data.get("mvidata", {}),  # MVI Server metadata
-            data.get("Alert", {}),  # Alert structure
-            data.get("Inherited metadata", {}),  # Inherited metadata
-            data.get("metadata", {}),  # Generic metadata
-        ]
-
-        # Search for each field in all nested structures
-        for thai_label, possible_keys in metadata_fields.items():
-            value = None
-
-            # Try each possible key in each nested object
-            for nested_obj in nested_objects:
-                if not isinstance(nested_obj, dict):
-                    continue
-
-                for key in possible_keys:
-                    if key in nested_obj and nested_obj[key]:
-                        value = nested_obj[key]
-                        break
-
-                if value:
-                    break
-
+        # Emit in display order
+        for thai_label in METADATA_FIELDS:
+            value = found.get(thai_label)
             if value:
                 metadata_found = True
                 # Format the value (truncate if too long)
                 value_str = str(value)
                 if len(value_str) > 60:
                     value_str = value_str[:57] + "..."
-                metadata_text += f"<b>{thai_label}:</b> {value_str}<br>"
+                parts.append(f"<b>{thai_label}:</b> {value_str}<br>")
 
         # Always check for Rule Results array (whether other metadata found or not)
-        if "Rule Results" in data:
-            rule_results = data.get("Rule Results", [])
-            if isinstance(rule_results, list) and len(rule_results) > 0:
-                metadata_found = True
-
-                # Add separator if there's already metadata
-                if metadata_text:
-                    metadata_text += "<br>"
+        rule_results = parsed.rule_results
+        if rule_results:
+            metadata_found = True
 
-                metadata_text += "<b>Rules:</b><br>"
+            # Add separator if there's already metadata
+            if parts:
+                parts.append("<br>")
 
-                for i, rule in enumerate(rule_results, 1):
-                    if isinstance(rule, dict):
-                        rule_name = rule.get("Rule Name", "Unknown")
-                        result_type = rule.get("Result Type", "unknown")
+            parts.append("<b>Rules:</b><br>")
 
-                        # Shorten rule name if too long (remove common prefixes)
-                        display_name = rule_name.replace("Check_", "").replace("_", " ")
-                        if len(display_name) > 25:
-                            display_name = display_name[:22] + "..."
+            for rule in rule_results:
+                if isinstance(rule, dict):
+                    rule_name = rule.get("Rule Name", "Unknown")
+                    result_type = rule.get("Result Type", "unknown")
 
-                        # Color code the result
-                        if result_type.lower() == "pass":
-                            color = "#28a745"  # Green
-                            icon = "✓"
-                        elif result_type.lower() == "fail":
-                            color = "#dc3545"  # Red
-                            icon = "✗"
-                        else:
-                            color = "#6c757d"  # Gray
-                            icon = "?"
+                    # Shorten rule name if too long (remove common prefixes)
+                    display_name = rule_name.replace("Check_", "").replace("_", " ")
+                    if len(display_name) > 25:
+                        display_name = display_name[:22] + "..."
 
-                        metadata_text += f'  <span style="color: {color}; font-weight: bold;">{icon}</span> {display_name}<br>'
+                    # Color code the result
+                    template = RULE_RESULT_TEMPLATES.get(result_type.lower(), RULE_RESULT_TEMPLATE_UNKNOWN)
+                    parts.append(template % display_name)
 
         # If still no metadata found, show default message
-        if not metadata_found:
+        if metadata_found:
+            metadata_text = "".join(parts)
+        else:
             metadata_text = "<i>ยังไม่มีข้อมูล</i>"
-            print(f"⚠️ {camera_id.upper()}: ไม่พบ metadata ที่ตรงกัน")
+            log.debug("⚠️ %s: ไม่พบ metadata ที่ตรงกัน", camera_id.upper())
 
         # Get the appropriate metadata label for this camera
-        if camera_id == "cam1":
-            metadata_label = self.cam1_metadata_label
-        else:  # cam2
-            metadata_label = self.cam2_metadata_label
+        metadata_label = self._cam_handles[camera_id].metadata_label
 
         # Update metadata label with HTML formatting
         metadata_label.setText(metadata_text)
 
-    def display_image(self, data):
+    def display_image(self, parsed):
         """Display image from MVI inspection result with dual camera support"""
         # Get Device ID to determine which camera
-        device_id = data.get("Device ID", "")
+        device_id = parsed.device_id
 
         # Get Image ID
-        image_id = data.get("Image ID", "")
-
-        # Get Image Path
-        image_path = data.get("Image Path", "")
-
-        # Get Detected Objects
-        detected_objects = data.get("Detected Objects", [])
+        image_id = parsed.image_id
 
         # Determine which camera to update based on Device ID
         # If no device ID mapping exists, assign to first available camera
         camera_id = None
 
         if device_id:
+            cam1 = self._cam_handles["cam1"]
+            cam2 = self._cam_handles["cam2"]
+
             # Check if this device_id is already assigned to a camera
-            if self.cam1_device_id == device_id:
+            if cam1.device_id == device_id:
                 camera_id = "cam1"
-            elif self.cam2_device_id == device_id:
+            elif cam2.device_id == device_id:
                 camera_id = "cam2"
-            elif self.cam1_device_id is None:
+            elif cam1.device_id is None:
                 # Assign to camera 1 if empty
                 camera_id = "cam1"
-                self.cam1_device_id = device_id
-            elif self.cam2_device_id is None:
+                cam1.device_id = device_id
+            elif cam2.device_id is None:
                 # Assign to camera 2 if empty
                 camera_id = "cam2"
-                self.cam2_device_id = device_id
+                cam2.device_id = device_id
             else:
                 # Both cameras occupied, show on cam1 temporarily but DON'T override device_id
                 # This allows seeing new device data without losing existing camera assignments
                 camera_id = "cam1"
-                print(f"⚠️ Both cameras occupied. Showing {device_id} on cam1 temporarily (cam1 still assigned to {self.cam1_device_id})")
+                log.debug("⚠️ Both cameras occupied. Showing %s on cam1 temporarily (cam1 still assigned to %s)", device_id, cam1.device_id)
         else:
             # No device ID provided - use order of reception for multi-topic mode
             # Check which camera has been updated in this trigger session
@@ -1160,24 +1622,52 @@ class MVITriggerGUI(QMainWindow):
                 else:
                     # Both cameras updated in this session, use cam1
                     camera_id = "cam1"
-                    print("⚠️ Both cameras already updated in this session. Showing new result on cam1.")
+                    log.debug("⚠️ Both cameras already updated in this session. Showing new result on cam1.")
             else:
                 # Fallback to cam1 if tracking variable doesn't exist
                 camera_id = "cam1"
 
-        print(f"📷 Displaying on {camera_id.upper()}: Device={device_id}, Image={image_id}")
+        log.debug("📷 Displaying on %s: Device=%s, Image=%s", camera_id.upper(), device_id, image_id)
+
+        # Track latest camera
+        self.latest_camera = camera_id
+
+        # Track which camera was updated in this trigger session (for multi-topic mode)
+        if hasattr(self, 'cameras_updated_in_session'):
+            self.cameras_updated_in_session.add(camera_id)
+            log.debug("📝 Camera %s marked as updated. Session cameras: %s", camera_id, self.cameras_updated_in_session)
+
+        # Coalesce widget updates: only the latest result per camera is shown
+        # on the next event-loop pass; a superseded result is still saved to history
+        superseded = self._pending_display.get(camera_id)
+        if superseded is not None:
+            self.load_image(camera_id, superseded, token=-1)
+        self._pending_display[camera_id] = parsed
+
+        if not self._display_flush_scheduled:
+            self._display_flush_scheduled = True
+            QTimer.singleShot(0, self.flush_pending_display)
+
+    def flush_pending_display(self):
+        """Show the latest pending result for each camera"""
+        self._display_flush_scheduled = False
+        pending = self._pending_display
+        self._pending_display = {}
+
+        for camera_id, parsed in pending.items():
+            self.display_camera_result(camera_id, parsed)
+
+    def display_camera_result(self, camera_id, parsed):
+        """Update camera widgets with an inspection result and start loading its image"""
+        device_id = parsed.device_id
+        image_id = parsed.image_id
+        image_path = parsed.image_path
 
         # Get the appropriate widgets for this camera
-        if camera_id == "cam1":
-            image_label = self.cam1_image_label
-            image_id_label = self.cam1_image_id_label
-            device_label = self.cam1_device_label
-            zoom_reset_btn = self.cam1_zoom_reset_btn
-        else:  # cam2
-            image_label = self.cam2_image_label
-            image_id_label = self.cam2_image_id_label
-            device_label = self.cam2_device_label
-            zoom_reset_btn = self.cam2_zoom_reset_btn
+        cam = self._cam_handles[camera_id]
+        image_label = cam.image_label
+        image_id_label = cam.image_id_label
+        device_label = cam.device_label
 
         # Update labels
         if device_id:
@@ -1191,248 +1681,211 @@ class MVITriggerGUI(QMainWindow):
             image_id_label.setText("Image: -")
 
         # Update metadata for this camera
-        self.display_metadata(camera_id, data)
+        self.display_metadata(camera_id, parsed)
 
         # Update status for this camera
-        self.update_camera_status(camera_id, data)
+        self.update_camera_status(camera_id, parsed)
 
-        # Track latest camera
-        self.latest_camera = camera_id
-
-        # Track which camera was updated in this trigger session (for multi-topic mode)
-        if hasattr(self, 'cameras_updated_in_session'):
-            self.cameras_updated_in_session.add(camera_id)
-            print(f"📝 Camera {camera_id} marked as updated. Session cameras: {self.cameras_updated_in_session}")
+        # Newer message for this camera supersedes any image still loading
+        cam.load_token += 1
 
-        # Save to history (will save after image is loaded)
-        image_pixmap_for_history = None
+        # Load image in a worker thread (display + history save continue in on_image_loaded)
+        if self.load_image(camera_id, parsed, cam.load_token):
+            return
 
-        # Try to load and display image
-        if image_path and os.path.exists(image_path):
-            try:
-                pixmap = QPixmap(image_path)
-
-                if not pixmap.isNull():
-                    # Draw bounding boxes if detected objects exist
-                    if detected_objects and isinstance(detected_objects, list) and len(detected_objects) > 0:
-                        pixmap = self.draw_bounding_boxes(pixmap, detected_objects)
-                        print(f"✓ วาด bounding boxes: {len(detected_objects)} วัตถุ")
-
-                    # Save pixmap for history
-                    image_pixmap_for_history = pixmap
-
-                    # Store original pixmap and reset zoom to 25%
-                    if camera_id == "cam1":
-                        self.cam1_pixmap = pixmap
-                        self.cam1_zoom = 0.25
-                    else:
-                        self.cam2_pixmap = pixmap
-                        self.cam2_zoom = 0.25
-
-                    zoom_reset_btn.setText("25%")
-
-                    # Apply current zoom level
-                    self.camera_apply_zoom(camera_id)
-
-                    print(f"✓ โหลดภาพสำเร็จ: {image_path} (ขนาดต้นฉบับ: {pixmap.width()}x{pixmap.height()})")
-                else:
-                    image_label.clear()
-                    image_label.setText(f"ไม่สามารถโหลดภาพได้\n{image_path}")
-                    print(f"⚠️ ไม่สามารถโหลดภาพ: {image_path}")
-
-            except Exception as e:
-                image_label.clear()
-                image_label.setText(f"เกิดข้อผิดพลาดในการโหลดภาพ\n{str(e)}")
-                print(f"❌ Error loading image: {e}")
-
-        elif image_path:
+        if image_path:
             # Path provided but file doesn't exist
             image_label.clear()
+            cam.scaled_source = None
             image_label.setText(f"ไม่พบไฟล์ภาพ\n{image_path}")
-            image_label.setStyleSheet(
-                "QLabel { background-color: #e9ecef; color: #6c757d; "
-                "border: 1px solid #dee2e6; border-radius: 5px; "
-                "padding: 20px; font-size: 12px; }"
-            )
-            print(f"⚠️ ไม่พบไฟล์ภาพ: {image_path}")
+            set_style_state(image_label, "placeholder")
+            log.warning("⚠️ ไม่พบไฟล์ภาพ: %s", image_path)
 
         else:
             # No image path provided
             image_label.clear()
+            cam.scaled_source = None
             image_label.setText("ยังไม่มีภาพ")
-            image_label.setStyleSheet(
-                "QLabel { background-color: #e9ecef; color: #6c757d; "
-                "border: 1px solid #dee2e6; border-radius: 5px; "
-                "padding: 20px; font-size: 12px; }"
+            set_style_state(image_label, "placeholder")
+            log.debug("ℹ️ ไม่มี Image Path ในข้อมูล MQTT")
+
+    def load_image(self, camera_id, parsed, token):
+        """
+        Start loading the result image in a worker thread
+
+        The image is shown in on_image_loaded only if token is still the
+        camera's current load_token; the result is saved to history either way.
+
+        Returns:
+            bool: True if a load was started, False if there is no image file
+                  (history is saved immediately without an image)
+        """
+        image_path = parsed.image_path
+        if image_path and os.path.exists(image_path):
+            job = ImageLoadJob(
+                self._image_loader, camera_id, token,
+                image_path, parsed.detected_objects, parsed
             )
-            print("ℹ️ ไม่มี Image Path ในข้อมูล MQTT")
+            QThreadPool.globalInstance().start(job)
+            return True
 
-        # Save to history database
-        try:
-            self.history_manager.save_inspection(data, image_pixmap_for_history)
-            # Refresh history tab if it's visible
-            if self.tabs.currentIndex() == 1:  # History tab
-                self.history_widget.load_history()
-        except Exception as e:
-            print(f"⚠️ Failed to save to history: {e}")
+        self.save_to_history(parsed.data, None)
+        return False
 
-    def draw_bounding_boxes(self, pixmap, detected_objects):
-        """Draw bounding boxes, labels, and scores on image"""
-        # Create a copy of pixmap to draw on
-        result_pixmap = QPixmap(pixmap)
-        painter = QPainter(result_pixmap)
+    def on_image_loaded(self, camera_id, token, image, parsed, error):
+        """Show an image decoded by ImageLoadJob and save the inspection to history"""
+        cam = self._cam_handles[camera_id]
+        image_label = cam.image_label
+        image_path = parsed.image_path
+        is_current = token == cam.load_token
 
-        try:
-            # Enable antialiasing for smoother lines
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-            for obj in detected_objects:
-                if not isinstance(obj, dict):
-                    continue
-
-                # Get bounding box coordinates
-                rectangle = obj.get("rectangle", {})
-                min_point = rectangle.get("min", {})
-                max_point = rectangle.get("max", {})
-
-                x1 = min_point.get("x", 0)
-                y1 = min_point.get("y", 0)
-                x2 = max_point.get("x", 0)
-                y2 = max_point.get("y", 0)
-
-                # Get label and score
-                label = obj.get("label", "Unknown")
-                score = obj.get("score", 0.0)
-
-                # Calculate width and height
-                width = x2 - x1
-                height = y2 - y1
-
-                if width <= 0 or height <= 0:
-                    continue
-
-                # Choose color based on score (red for low, yellow for medium, green for high)
-                if score >= 0.8:
-                    color = QColor(40, 167, 69)  # Green #28a745
-                elif score >= 0.5:
-                    color = QColor(255, 193, 7)  # Yellow #ffc107
-                else:
-                    color = QColor(220, 53, 69)  # Red #dc3545
+        # Save to history (image with bounding boxes, if loaded)
+        image_for_history = None
 
-                # Draw bounding box
-                pen = QPen(color, 3)  # 3px thick line
-                painter.setPen(pen)
-                painter.drawRect(int(x1), int(y1), int(width), int(height))
+        if image is not None and not image.isNull():
+            image_for_history = image
 
-                # Prepare label text
-                label_text = f"{label} {score:.2f}"
+            if is_current:
+                # Only the current load is shown, so only it pays for the
+                # QImage -> QPixmap conversion (superseded loads just get saved)
+                pixmap = QPixmap.fromImage(image)
 
-                # Draw label background (filled rectangle)
-                font = QFont("Arial", 12, QFont.Weight.Bold)
-                painter.setFont(font)
-                metrics = painter.fontMetrics()
-                text_width = metrics.horizontalAdvance(label_text) + 10
-                text_height = metrics.height() + 6
+                # Store original pixmap and reset zoom to 25%
+                cam.pixmap = pixmap
+                cam.scaled_cache.clear()
+                cam.zoom = 0.25
 
-                # Position label above box (or below if near top edge)
-                label_y = int(y1) - text_height if y1 > text_height + 5 else int(y1) + int(height) + text_height
+                cam.zoom_reset_btn.setText("25%")
 
-                # Draw label background
-                painter.fillRect(int(x1), label_y - text_height + 3, text_width, text_height, color)
+                # Apply current zoom level
+                self.camera_apply_zoom(camera_id)
 
-                # Draw label text
-                painter.setPen(QPen(Qt.GlobalColor.white))
-                painter.drawText(int(x1) + 5, label_y - 3, label_text)
+                log.debug("✓ โหลดภาพสำเร็จ: %s (ขนาดต้นฉบับ: %dx%d)", image_path, pixmap.width(), pixmap.height())
 
-        finally:
-            painter.end()
-
-        return result_pixmap
-
-    def camera_apply_zoom(self, camera_id):
-        """Apply current zoom level to camera image"""
-        if camera_id == "cam1":
-            pixmap = self.cam1_pixmap
-            zoom_level = self.cam1_zoom
-            image_label = self.cam1_image_label
-            zoom_reset_btn = self.cam1_zoom_reset_btn
-        else:  # cam2
-            pixmap = self.cam2_pixmap
-            zoom_level = self.cam2_zoom
-            image_label = self.cam2_image_label
-            zoom_reset_btn = self.cam2_zoom_reset_btn
+        elif is_current:
+            image_label.clear()
+            cam.scaled_source = None
+            if error:
+                image_label.setText(f"เกิดข้อผิดพลาดในการโหลดภาพ\n{error}")
+                log.error("❌ Error loading image: %s", error)
+            else:
+                image_label.setText(f"ไม่สามารถโหลดภาพได้\n{image_path}")
+                log.warning("⚠️ ไม่สามารถโหลดภาพ: %s", image_path)
+
+        self.save_to_history(parsed.data, image_for_history)
+
+    def save_to_history(self, data, image):
+        """Queue inspection result for saving to history database"""
+        self.history_queue.put(data, image)
+
+    def on_history_saved(self):
+        """Mark history stale and schedule a throttled refresh"""
+        self._history_dirty = True
+        if not self._history_refresh_timer.isActive():
+            self._history_refresh_timer.start()
+
+    def refresh_history_if_visible(self):
+        """Refresh history tab if it's visible and has unseen saves"""
+        if self._history_dirty and self.tabs.currentIndex() == 1:  # History tab
+            self._history_dirty = False
+            self.history_widget.load_history()
+
+    def on_tab_changed(self, index):
+        """Catch up on saves made while the history tab was hidden"""
+        if index == 1:
+            self.refresh_history_if_visible()
+
+    def camera_apply_zoom(self, camera_id, smooth=True):
+        """Apply current zoom level to camera image (fast scaling if smooth=False)"""
+        cam = self._cam_handles[camera_id]
+        pixmap = cam.pixmap
+        zoom_level = cam.zoom
+        image_label = cam.image_label
+        zoom_reset_btn = cam.zoom_reset_btn
 
         if pixmap and not pixmap.isNull():
-            # Calculate new size based on zoom level
-            new_width = int(pixmap.width() * zoom_level)
-            new_height = int(pixmap.height() * zoom_level)
-
-            # Scale pixmap
-            scaled_pixmap = pixmap.scaled(
-                new_width, new_height,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
+            # Skip the resample if this exact image is already shown at this zoom
+            if (cam.scaled_source is pixmap and cam.scaled_zoom == zoom_level
+                    and (cam.scaled_smooth or not smooth)):
+                return
+
+            # Reuse a smooth rescale of this image at this zoom if one is cached
+            cache = cam.scaled_cache
+            cache_key = round(zoom_level * 100)
+            scaled_pixmap = cache.get(cache_key)
+            if scaled_pixmap is not None:
+                cache.move_to_end(cache_key)
+                smooth = True
+            else:
+                # Calculate new size based on zoom level
+                new_width = int(pixmap.width() * zoom_level)
+                new_height = int(pixmap.height() * zoom_level)
+
+                # Scale pixmap
+                scaled_pixmap = pixmap.scaled(
+                    new_width, new_height,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation if smooth
+                    else Qt.TransformationMode.FastTransformation
+                )
+                if smooth:
+                    cache[cache_key] = scaled_pixmap
+                    if len(cache) > SCALED_CACHE_SIZE:
+                        cache.popitem(last=False)
 
             image_label.setPixmap(scaled_pixmap)
-            image_label.setStyleSheet(
-                "QLabel { background-color: #e9ecef; "
-                "border: 1px solid #dee2e6; border-radius: 5px; }"
-            )
+            set_style_state(image_label, "loaded")
             image_label.resize(scaled_pixmap.size())
 
+            cam.scaled_source = pixmap
+            cam.scaled_zoom = zoom_level
+            cam.scaled_smooth = smooth
+
             # Update zoom button text
             zoom_reset_btn.setText(f"{int(zoom_level * 100)}%")
 
+    def camera_apply_zoom_burst(self, camera_id):
+        """Apply zoom with fast scaling, then smooth re-render once clicks settle"""
+        self.camera_apply_zoom(camera_id, smooth=False)
+        self._zoom_settle_cams.add(camera_id)
+        self._zoom_settle_timer.start()
+
+    def on_zoom_settled(self):
+        """Re-render zoomed camera images with smooth scaling"""
+        for camera_id in self._zoom_settle_cams:
+            self.camera_apply_zoom(camera_id)
+        self._zoom_settle_cams.clear()
+
     def camera_zoom_in(self, camera_id):
         """Zoom in on camera image"""
-        if camera_id == "cam1":
-            if self.cam1_pixmap:
-                self.cam1_zoom = min(self.cam1_zoom + 0.25, 5.0)  # Max 500%
-                self.camera_apply_zoom(camera_id)
-                print(f"🔍 CAM1 Zoom In: {int(self.cam1_zoom * 100)}%")
-        else:  # cam2
-            if self.cam2_pixmap:
-                self.cam2_zoom = min(self.cam2_zoom + 0.25, 5.0)  # Max 500%
-                self.camera_apply_zoom(camera_id)
-                print(f"🔍 CAM2 Zoom In: {int(self.cam2_zoom * 100)}%")
+        cam = self._cam_handles[camera_id]
+        if cam.pixmap:
+            cam.zoom = min(cam.zoom + 0.25, 5.0)  # Max 500%
+            self.camera_apply_zoom_burst(camera_id)
+            log.debug("🔍 %s Zoom In: %d%%", camera_id.upper(), int(cam.zoom * 100))
 
     def camera_zoom_out(self, camera_id):
         """Zoom out on camera image"""
-        if camera_id == "cam1":
-            if self.cam1_pixmap:
-                self.cam1_zoom = max(self.cam1_zoom - 0.25, 0.25)  # Min 25%
-                self.camera_apply_zoom(camera_id)
-                print(f"🔍 CAM1 Zoom Out: {int(self.cam1_zoom * 100)}%")
-        else:  # cam2
-            if self.cam2_pixmap:
-                self.cam2_zoom = max(self.cam2_zoom - 0.25, 0.25)  # Min 25%
-                self.camera_apply_zoom(camera_id)
-                print(f"🔍 CAM2 Zoom Out: {int(self.cam2_zoom * 100)}%")
+        cam = self._cam_handles[camera_id]
+        if cam.pixmap:
+            cam.zoom = max(cam.zoom - 0.25, 0.25)  # Min 25%
+            self.camera_apply_zoom_burst(camera_id)
+            log.debug("🔍 %s Zoom Out: %d%%", camera_id.upper(), int(cam.zoom * 100))
 
     def camera_zoom_reset(self, camera_id):
         """Reset camera zoom to 25%"""
-        if camera_id == "cam1":
-            if self.cam1_pixmap:
-                self.cam1_zoom = 0.25
-                self.camera_apply_zoom(camera_id)
-                print(f"🔍 CAM1 Zoom Reset: 25%")
-        else:  # cam2
-            if self.cam2_pixmap:
-                self.cam2_zoom = 0.25
-                self.camera_apply_zoom(camera_id)
-                print(f"🔍 CAM2 Zoom Reset: 25%")
+        cam = self._cam_handles[camera_id]
+        if cam.pixmap:
+            cam.zoom = 0.25
+            self.camera_apply_zoom(camera_id)
+            log.debug("🔍 %s Zoom Reset: 25%%", camera_id.upper())
 
     def camera_show_fullscreen(self, camera_id):
         """Show camera image in fullscreen mode"""
-        if camera_id == "cam1":
-            pixmap = self.cam1_pixmap
-            image_id = self.cam1_image_id_label.text()
-            device_id = self.cam1_device_label.text()
-        else:  # cam2
-            pixmap = self.cam2_pixmap
-            image_id = self.cam2_image_id_label.text()
-            device_id = self.cam2_device_label.text()
+        cam = self._cam_handles[camera_id]
+        pixmap = cam.pixmap
+        image_id = cam.image_id_label.text()
+        device_id = cam.device_label.text()
 
         if pixmap and not pixmap.isNull():
             fullscreen_dialog = FullscreenImageDialog(pixmap, f"{device_id} | {image_id}", self)
@@ -1448,8 +1901,32 @@ class MVITriggerGUI(QMainWindow):
 
     def closeEvent(self, event):
         """Handle window close event"""
+        # Flush pending UI state save
+        if self._save_ui_timer.isActive():
+            self._save_ui_timer.stop()
+            self._do_save_ui_state()
+
         if self.mqtt_client:
             self.mqtt_client.disconnect()
+
+        # Hand every received result to the history queue before stopping it:
+        # flush results still waiting for display, let the image jobs finish
+        # and deliver their queued on_image_loaded calls (which may in turn
+        # queue more results, so repeat until nothing is left)
+        pool = QThreadPool.globalInstance()
+        while True:
+            self.flush_pending_display()
+            pool.waitForDone()
+            QApplication.processEvents()
+            if not self._pending_display and pool.activeThreadCount() == 0:
+                break
+
+        # Finish pending history saves; leave the database open if the worker
+        # is still writing (closing it would only make the worker reopen it)
+        if self.history_queue.stop():
+            self.history_manager.close()
+        else:
+            log.warning("⚠️ History saves still running at exit, database left open")
         event.accept()
 
 
@@ -1460,11 +1937,25 @@ class FullscreenImageDialog(QDialog):
         super().__init__(parent)
         self.pixmap = pixmap
         self.zoom_level = 1.0
+        self._shown_zoom = None  # (zoom_level, smooth) currently in image_label
+        self._scaled_cache = OrderedDict()  # zoom level -> smooth-scaled pixmap
 
         # Mouse drag variables
         self.dragging = False
         self.last_pos = None
 
+        # Zoom clicks/key repeats use fast scaling; re-render smoothly once they settle
+        self._smooth_timer = QTimer(self)
+        self._smooth_timer.setSingleShot(True)
+        self._smooth_timer.setInterval(150)
+        self._smooth_timer.timeout.connect(self.apply_zoom)
+
+        # Key autorepeat: rescale once per frame for the latest zoom level only
+        self._zoom_frame_timer = QTimer(self)
+        self._zoom_frame_timer.setSingleShot(True)
+        self._zoom_frame_timer.setInterval(16)
+        self._zoom_frame_timer.timeout.connect(self.apply_zoom_burst)
+
         self.setWindowTitle("Full Screen View")
         self.setModal(True)
 
@@ -1550,34 +2041,72 @@ class FullscreenImageDialog(QDialog):
             }
         """)
 
-    def apply_zoom(self):
-        """Apply zoom to fullscreen image"""
+    def apply_zoom(self, smooth=True):
+        """Apply zoom to fullscreen image (fast scaling if smooth=False)"""
         if self.pixmap and not self.pixmap.isNull():
-            new_width = int(self.pixmap.width() * self.zoom_level)
-            new_height = int(self.pixmap.height() * self.zoom_level)
+            # Skip if this zoom is already shown at this quality or better
+            shown = self._shown_zoom
+            if shown is not None and shown[0] == self.zoom_level and (shown[1] or not smooth):
+                return
 
-            scaled_pixmap = self.pixmap.scaled(
-                new_width, new_height,
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
+            # At 100% show the shared pixmap as-is (no full-res resample)
+            if self.zoom_level == 1.0:
+                self.image_label.setPixmap(self.pixmap)
+                self.image_label.resize(self.pixmap.size())
+                self.zoom_label.setText("100%")
+                self._shown_zoom = (1.0, True)
+                return
 
+            # Reuse a smooth rescale at this zoom if one is cached
+            cache = self._scaled_cache
+            cache_key = round(self.zoom_level, 2)
+            scaled_pixmap = cache.get(cache_key)
+            if scaled_pixmap is not None:
+                cache.move_to_end(cache_key)
+                smooth = True
+            else:
+                new_width = int(self.pixmap.width() * self.zoom_level)
+                new_height = int(self.pixmap.height() * self.zoom_level)
+
+                scaled_pixmap = self.pixmap.scaled(
+                    new_width, new_height,
+                    Qt.AspectRatioMode.KeepAspectRatio,
+                    Qt.TransformationMode.SmoothTransformation if smooth
+                    else Qt.TransformationMode.FastTransformation
+                )
+                if smooth:
+                    cache[cache_key] = scaled_pixmap
+                    if len(cache) > FULLSCREEN_SCALED_CACHE_SIZE:
+                        cache.popitem(last=False)
+
+            self._shown_zoom = (self.zoom_level, smooth)
             self.image_label.setPixmap(scaled_pixmap)
             self.image_label.resize(scaled_pixmap.size())
             self.zoom_label.setText(f"{int(self.zoom_level * 100)}%")
 
+    def apply_zoom_burst(self):
+        """Apply zoom with fast scaling, then smooth re-render once clicks settle"""
+        self.apply_zoom(smooth=False)
+        self._smooth_timer.start()
+
+    def schedule_zoom(self):
+        """Coalesce zoom steps into one rescale on the next frame"""
+        if not self._zoom_frame_timer.isActive():
+            self._zoom_frame_timer.start()
+
     def zoom_in(self):
         """Zoom in"""
         self.zoom_level = min(self.zoom_level + 0.25, 10.0)  # Max 1000% in fullscreen
-        self.apply_zoom()
+        self.schedule_zoom()
 
     def zoom_out(self):
         """Zoom out"""
         self.zoom_level = max(self.zoom_level - 0.25, 0.1)  # Min 10%
-        self.apply_zoom()
+        self.schedule_zoom()
 
     def zoom_reset(self):
         """Reset zoom"""
+        self._zoom_frame_timer.stop()
         self.zoom_level = 1.0
         self.apply_zoom()
 
@@ -1629,6 +2158,7 @@ class FullscreenImageDialog(QDialog):
 
 def main():
     """Main application entry point"""
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     app = QApplication(sys.argv)
     window = MVITriggerGUI()
     window.show()
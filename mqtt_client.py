@@ -4,6 +4,13 @@ Handles MQTT connection, publishing triggers, and receiving results
 """
 import paho.mqtt.client as mqtt
 import json
+import logging
+
+# Use orjson for faster JSON parsing when available
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Try to import PyQt6, fallback to PySide6 if not available
 try:
@@ -11,6 +18,15 @@ try:
 except ImportError:
     from PySide6.QtCore import QObject, Signal as pyqtSignal
 
+log = logging.getLogger(__name__)
+
+
+def json_dumps(obj):
+    """Serialize to compact JSON bytes for publishing (orjson if installed)"""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
 
 class MQTTClient(QObject):
     """MQTT Client with Qt signals for GUI integration"""
@@ -18,7 +34,8 @@ class MQTTClient(QObject):
     # Qt Signals
     connected = pyqtSignal()
     disconnected = pyqtSignal()
-    message_received = pyqtSignal(str, str)  # topic, payload
+    message_received = pyqtSignal(str, str)  # topic, payload (non-JSON messages)
+    message_parsed = pyqtSignal(str, object)  # topic, parsed JSON data
     connection_error = pyqtSignal(str)
 
     def __init__(self, broker, port, username="", password="", qos=1):
@@ -29,11 +46,19 @@ class MQTTClient(QObject):
         self.password = password
         self.qos = qos
 
-        self.client = mqtt.Client(client_id="MVI_GUI_Trigger")
+        # Clean session: with a fixed client ID a persistent session would
+        # replay results queued while the app was closed and keep old topics
+        self.client = mqtt.Client(client_id="MVI_GUI_Trigger", clean_session=True)
+        self.client.reconnect_delay_set(min_delay=1, max_delay=30)
         self.client.on_connect = self._on_connect
         self.client.on_disconnect = self._on_disconnect
         self.client.on_message = self._on_message
 
+        # Let QoS 1/2 publishes pipeline instead of waiting on paho's default
+        # in-flight window of 20 unacknowledged messages
+        self.client.max_inflight_messages_set(100)
+        self.client.max_queued_messages_set(10000)
+
         if username and password:
             self.client.username_pw_set(username, password)
 
@@ -45,7 +70,7 @@ class MQTTClient(QObject):
         if rc == 0:
             self.is_connected = True
             self.connected.emit()
-            # Subscribe to result topics
+            # Subscribe to result topics (every connect starts a clean session)
             for topic in self.subscribe_topics:
                 self.client.subscribe(topic, self.qos)
         else:
@@ -58,11 +83,22 @@ class MQTTClient(QObject):
 
     def _on_message(self, client, userdata, msg):
         """Callback when message received"""
+        # Runs on the paho network thread, so JSON is parsed off the GUI thread;
+        # the signals are delivered to GUI slots as queued connections
         try:
-            payload = msg.payload.decode('utf-8')
-            self.message_received.emit(msg.topic, payload)
+            try:
+                if orjson is not None:
+                    data = orjson.loads(msg.payload)
+                else:
+                    data = json.loads(msg.payload)
+            except ValueError:
+                # Not JSON (JSONDecodeError/UnicodeDecodeError), pass the raw text on
+                payload = msg.payload.decode('utf-8')
+                self.message_received.emit(msg.topic, payload)
+                return
+            self.message_parsed.emit(msg.topic, data)
         except Exception as e:
-            print(f"Error processing message: {e}")
+            log.error("❌ Error processing message: %s", e)
 
     def connect(self):
         """Connect to MQTT broker"""
@@ -90,10 +126,43 @@ class MQTTClient(QObject):
         if self.is_connected:
             try:
                 if isinstance(payload, dict):
-                    payload = json.dumps(payload)
+                    payload = json_dumps(payload)
                 self.client.publish(topic, payload, qos=self.qos)
                 return True
             except Exception as e:
-                print(f"Error publishing message: {e}")
+                log.error("❌ Error publishing message: %s", e)
                 return False
         return False
+
+    def publish_batch(self, messages):
+        """
+        Publish several messages in one call
+
+        Payloads are serialized once per distinct object, so triggering N topics
+        with the same message encodes the JSON only once. Packets are queued to
+        paho's network loop, which flushes them together.
+
+        Args:
+            messages: iterable of (topic, payload) tuples
+
+        Returns:
+            list: True/False per message, in input order
+        """
+        if not self.is_connected:
+            return [False for _ in messages]
+
+        encoded = {}  # id(payload) -> serialized payload
+        results = []
+        for topic, payload in messages:
+            try:
+                if isinstance(payload, dict):
+                    key = id(payload)
+                    if key not in encoded:
+                        encoded[key] = json_dumps(payload)
+                    payload = encoded[key]
+                self.client.publish(topic, payload, qos=self.qos)
+                results.append(True)
+            except Exception as e:
+                log.error("❌ Error publishing message: %s", e)
+                results.append(False)
+        return results